@@ -1,18 +1,27 @@
 ﻿from __future__ import annotations
 
+import copy
+import functools
 import json
 from pathlib import Path
+from typing import Any
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CONFIG_DIR = PROJECT_ROOT / "config"
 
 
-def load_json(name: str) -> dict:
+@functools.lru_cache(maxsize=None)
+def _load_json_cached(name: str) -> Any:
     path = CONFIG_DIR / name
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
 
 
+def load_json(name: str) -> Any:
+    # Callers get their own copy so the cached config cannot be mutated between runs.
+    return copy.deepcopy(_load_json_cached(name))
+
+
 def load_required_metrics() -> list[str]:
     data = load_json("requiredMetrics.json")
     return list(data)
@@ -1,11 +1,16 @@
 ﻿from __future__ import annotations
 
+import functools
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import date
-from typing import Any
+from typing import Any, Iterable
 
 from docx import Document
+from docx.oxml.ns import qn
 
 MONTHS = {
     "январь": 1,
@@ -51,11 +56,23 @@ KY_DATE_PATTERN_2 = re.compile(
     r"\b(\d{4})-жыл(?:дын)?\s*([А-Яа-яӨөҮүҢңІіЁё]+)\s*(\d{1,2})\s*күнү\b",
     re.IGNORECASE,
 )
+# A leading "(?=[...])" lists a row-scanning pattern's possible first characters, so the regex
+# engine skips non-candidate positions without entering the alternation.
+DATE_ANY_PATTERN = re.compile(
+    r"(?=\d)(?:"
+    r"\b(?P<dmy>(?P<dmy_d>\d{1,2})[./-](?P<dmy_m>\d{1,2})[./-](?P<dmy_y>\d{2,4})(?:\s*г\.?|\.?ж\.?)?)\b"
+    r"|\b(?P<iso>\d{4}-\d{2}-\d{2})\b"
+    r"|(?i:\b(?P<ky1>\d{4}-жыл(?:дын)?\s*\d{1,2}[-\s]*[А-Яа-яӨөҮүҢңІіЁё]+\s*күнү)\b)"
+    r"|(?i:\b(?P<ky2>\d{4}-жыл(?:дын)?\s*[А-Яа-яӨөҮүҢңІіЁё]+\s*\d{1,2}\s*күнү)\b)"
+    r")"
+)
+NUMBER_PATTERN = re.compile(r"\b(\d[\d\s]*)\b")
 CASE_ID_PATTERN = re.compile(
-    r"(?:ЕРП|КЖБР)\s*№?\s*([\d\-/]+)", re.IGNORECASE
+    r"(?=[ЕеКк])(?:ЕРП|КЖБР)\s*№?\s*([\d\-/]+)", re.IGNORECASE
 )
 ALT_CASE_ID_PATTERN = re.compile(r"\b\d{2}-\d{3}-\d{4}-\d{6}\b")
 FALLBACK_CASE_ID_PATTERN = re.compile(r"\b\d{6,}\b")
+OUTCOME_HINT_PATTERN = re.compile(r"(?=[тТ2пП])(?:токт|246-|прокур)", re.IGNORECASE)
 ARTICLE_PATTERN = re.compile(
     r"(?:ст\.?|статья)\s*([0-9]{1,3})(?:\s*[-–]\s*([0-9]+))?(?:\s*ч\.?\s*([0-9]+))?",
     re.IGNORECASE,
@@ -69,9 +86,19 @@ ARTICLE_KG_PATTERN = re.compile(
     re.IGNORECASE,
 )
 ARTICLE_GENERIC_PATTERN = re.compile(
-    r"(?:ст\.?|бер)\s*([0-9]{1,3})(?:\s*[-–]\s*([0-9]{1,3}))?(?:\s*[-–]?\s*([0-9]+)\s*[-–]?\s*б\.)?",
+    r"(?=[сСбБ])(?:ст\.?|бер)\s*([0-9]{1,3})(?:\s*[-–]\s*([0-9]{1,3}))?(?:\s*[-–]?\s*([0-9]+)\s*[-–]?\s*б\.)?",
+    re.IGNORECASE,
+)
+ARTICLE_CELL_PATTERN = re.compile(
+    r"(?=[\dсС])(?:"
+    r"(?P<std>(?:ст\.?|статья)\s*(?P<std_base>[0-9]{1,3})(?:\s*[-–]\s*(?P<std_ext>[0-9]+))?(?:\s*ч\.?\s*(?P<std_part>[0-9]+))?)"
+    r"|\b(?P<uk>(?P<uk_base>[0-9]{1,3})(?:\s*[-–]\s*(?P<uk_ext>[0-9]+))?(?:\s*ч\.?\s*(?P<uk_part>[0-9]+))?\s*(?:УК|КК))\b"
+    r"|\b(?P<kg>(?P<kg_base>[0-9]{1,3})\s*[-–]?\s*бер(?:\s*(?P<kg_part>[0-9]+)\s*[-–]?\s*б\.)?)\b"
+    r")",
     re.IGNORECASE,
 )
+ARTICLE_KIND_RANK = {"std": 0, "uk": 1, "kg": 2}
+BREAKDOWN_FIELDS = ("women_u18", "women_ge18", "women_total", "stopped", "new", "total_cases")
 
 WOMEN_TAGS = [
     "аялга карата",
@@ -102,7 +129,37 @@ STOP_WORDS = [
 ]
 
 
-@dataclass
+def _minimal_stems(words: list[str]) -> tuple[str, ...]:
+    # Every word contains one of these stems, so only the stems need to be searched.
+    return tuple(word for word in words if not any(other != word and other in word for other in words))
+
+
+WOMEN_TAG_STEMS = _minimal_stems(WOMEN_TAGS)
+MINOR_TAG_STEMS = _minimal_stems(MINOR_TAGS)
+STOP_WORD_STEMS = _minimal_stems(STOP_WORDS)
+
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+NORMALIZE_TRANSLATION = str.maketrans({"\u00a0": " ", "–": "-", "—": "-"})
+
+W_P = qn("w:p")
+W_R = qn("w:r")
+W_T = qn("w:t")
+W_HYPERLINK = qn("w:hyperlink")
+W_TBL = qn("w:tbl")
+W_TR = qn("w:tr")
+W_TC = qn("w:tc")
+W_TRPR = qn("w:trPr")
+W_TCPR = qn("w:tcPr")
+W_GRID_BEFORE = qn("w:gridBefore")
+W_GRID_SPAN = qn("w:gridSpan")
+W_VMERGE = qn("w:vMerge")
+W_VAL = qn("w:val")
+# Run children other than w:t that python-docx renders as text (breaks, tabs, hyphens).
+RUN_TEXT_TAGS = frozenset(qn(tag) for tag in ("w:br", "w:cr", "w:noBreakHyphen", "w:ptab", "w:tab"))
+
+
+@dataclass(slots=True, frozen=True)
 class SourcePointer:
     table_index: int
     row_index: int
@@ -110,17 +167,98 @@ class SourcePointer:
     text: str
 
 
+@dataclass
+class DocumentSnapshot:
+    paragraph_texts: list[str]
+    table_cells: list[list[list[str]]]
+    table_row_texts: list[list[str]]
+    table_row_lowers: list[list[str]]
+
+
+@functools.lru_cache(maxsize=8192)
 def normalize_text(value: str) -> str:
-    cleaned = value.replace("\u00a0", " ").replace("–", "-").replace("—", "-")
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned.strip()
+    return " ".join(value.translate(NORMALIZE_TRANSLATION).split())
 
 
+@functools.lru_cache(maxsize=8192)
 def normalize_lower(value: str) -> str:
     return normalize_text(value).lower()
 
 
-def parse_report_month(texts: list[str]) -> dict | None:
+def clear_caches() -> None:
+    normalize_text.cache_clear()
+    normalize_lower.cache_clear()
+
+
+def _regex_literal_prefix(regex: str) -> str:
+    # Leading literal text every match must start with; empty when it cannot be determined.
+    if "|" in regex:
+        return ""
+    end = 0
+    while end < len(regex) and regex[end] not in REGEX_METACHARACTERS:
+        end += 1
+    if end < len(regex) and regex[end] in "*+?{":
+        end -= 1
+    return regex[:max(end, 0)].lower()
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_metric_regex(regex: str) -> tuple[re.Pattern, str]:
+    # Keyed on the raw pattern, so every extraction after the first reuses the same compiled regexes.
+    return re.compile(regex, re.IGNORECASE), _regex_literal_prefix(regex)
+
+
+def _metric_keyword_index(entries: list[tuple[str, dict]]) -> tuple[re.Pattern | None, dict[str, set[str]], set[str]]:
+    # A metric is only a candidate for a source if one of its regex literals or phrases occurs in it.
+    owners: dict[str, set[str]] = {}
+    always: set[str] = set()
+    for key, entry in entries:
+        if "" in entry["_regex_literals"]:
+            always.add(key)
+            continue
+        for keyword in (*entry["_regex_literals"], *entry["_patterns_norm"]):
+            owners.setdefault(keyword, set()).add(key)
+    if not owners:
+        return None, owners, always
+    keywords = sorted(owners, key=len, reverse=True)
+    # The lookahead reports only the longest keyword per position, so it also carries its prefixes' owners.
+    closed = {
+        keyword: set().union(*(owners[prefix] for prefix in owners if keyword.startswith(prefix)))
+        for keyword in keywords
+    }
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+    return pattern, closed, always
+
+
+def _metric_candidates(lowered: str, index: tuple[re.Pattern | None, dict[str, set[str]], set[str]]) -> set[str]:
+    pattern, owners, always = index
+    candidates = set(always)
+    if pattern is not None:
+        for keyword in {match.group(1) for match in pattern.finditer(lowered)}:
+            candidates |= owners[keyword]
+    return candidates
+
+
+def compile_metric_dictionary(metric_dictionary: dict) -> dict:
+    compiled: dict[str, dict] = {}
+    for key, entry in metric_dictionary.items():
+        if "_patterns_norm" in entry:
+            compiled[key] = entry
+            continue
+        compiled_regex = [
+            _compile_metric_regex(regex) if isinstance(regex, str) else (regex, _regex_literal_prefix(regex.pattern))
+            for regex in entry.get("regex", [])
+        ]
+        compiled[key] = {
+            **entry,
+            "regex": [pattern for pattern, _ in compiled_regex],
+            "_regex_literals": [literal for _, literal in compiled_regex],
+            "_patterns_norm": [normalize_lower(phrase) for phrase in entry.get("patterns", [])],
+        }
+    return compiled
+
+
+def parse_report_month(texts: Iterable[str]) -> dict | None:
     for text in texts:
         for pattern in REPORT_MONTH_PATTERNS:
             match = pattern.search(text)
@@ -138,7 +276,7 @@ def parse_report_month(texts: list[str]) -> dict | None:
     return None
 
 
-def parse_date_from_text(text: str) -> date | None:
+def _parse_date_by_priority(text: str) -> date | None:
     match = DATE_PATTERN.search(text)
     if match:
         day, month, year = match.groups()
@@ -180,50 +318,197 @@ def parse_date_from_text(text: str) -> date | None:
     return None
 
 
-def extract_metrics(document: Document, metric_dictionary: dict) -> tuple[dict, list[dict], list[dict]]:
-    metrics: dict[str, dict[str, Any]] = {}
+def parse_date_from_text(text: str) -> date | None:
+    match = DATE_ANY_PATTERN.search(text)
+    if not match:
+        return None
+    # A leftmost day-month-year match is exactly what DATE_PATTERN would find. Any other
+    # kind may still lose to a higher-priority format further right, so re-check in order.
+    if match.lastgroup != "dmy":
+        return _parse_date_by_priority(text)
+
+    year = match.group("dmy_y")
+    if len(year) == 2:
+        year = f"20{year}"
+    try:
+        return date(int(year), int(match.group("dmy_m")), int(match.group("dmy_d")))
+    except ValueError:
+        return None
+
+
+def _find_number(text: str) -> str | None:
+    match = NUMBER_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+def _cell_index_at(cell_texts: list[str], offset: int) -> int:
+    end = 0
+    for c_index, cell_text in enumerate(cell_texts):
+        end += len(cell_text) + 3
+        if offset < end:
+            return c_index
+    return len(cell_texts) - 1
+
+
+def _run_text(run: Any, parts: list[str]) -> None:
+    for child in run:
+        if child.tag == W_T:
+            parts.append(child.text or "")
+        elif child.tag in RUN_TEXT_TAGS:
+            parts.append(str(child))
+
+
+def _paragraph_text(paragraph: Any) -> str:
+    # Same text as python-docx's Paragraph.text: runs and hyperlink runs, in document order.
+    parts: list[str] = []
+    for child in paragraph:
+        if child.tag == W_R:
+            _run_text(child, parts)
+        elif child.tag == W_HYPERLINK:
+            for run in child:
+                if run.tag == W_R:
+                    _run_text(run, parts)
+    return "".join(parts)
+
+
+def _child_val(element: Any, property_tag: str, tag: str) -> str | None:
+    properties = element.find(property_tag)
+    if properties is None:
+        return None
+    child = properties.find(tag)
+    if child is None:
+        return None
+    return child.get(W_VAL, "continue" if tag == W_VMERGE else None)
+
+
+def _table_grid_rows(tbl: Any) -> list[list[Any]]:
+    # Same cells as python-docx's Row.cells without its per-cell xpath walks: a gridSpan cell
+    # repeats once per grid column and a vMerge="continue" cell resolves to the cell above it.
+    rows: list[list[Any]] = []
+    above: dict[int, Any] | None = None
+    spans: dict[Any, int] = {}
+    for tr in tbl.iterchildren(W_TR):
+        offset = int(_child_val(tr, W_TRPR, W_GRID_BEFORE) or 0)
+        starts: dict[int, Any] = {}
+        row: list[Any] = []
+        for tc in tr.iterchildren(W_TC):
+            span = spans[tc] = int(_child_val(tc, W_TCPR, W_GRID_SPAN) or 1)
+            root = tc
+            if _child_val(tc, W_TCPR, W_VMERGE) == "continue":
+                if above is None:
+                    raise ValueError("no tr above topmost tr in w:tbl")
+                root = above.get(offset)
+                if root is None:
+                    raise ValueError(f"no `tc` element at grid_offset={offset}")
+            starts[offset] = root
+            row.extend([root] * spans[root])
+            offset += span
+        rows.append(row)
+        above = starts
+    return rows
+
+
+def snapshot_document(document: Document) -> DocumentSnapshot:
+    # Read-only walk over the underlying XML; skips python-docx's Paragraph/Row/Cell proxies.
+    body = document.element.body
+    paragraph_texts = [normalize_text(_paragraph_text(p)) for p in body.iterchildren(W_P)]
+    table_cells: list[list[list[str]]] = []
+    table_row_texts: list[list[str]] = []
+    table_row_lowers: list[list[str]] = []
+    for tbl in body.iterchildren(W_TBL):
+        rows_cells: list[list[str]] = []
+        row_texts: list[str] = []
+        row_lowers: list[str] = []
+        # Merged cells are returned once per spanned grid column; read each <w:tc> only once.
+        seen_cells: dict[Any, str] = {}
+        for row in _table_grid_rows(tbl):
+            cell_texts = []
+            for tc in row:
+                text = seen_cells.get(tc)
+                if text is None:
+                    text = normalize_text("\n".join(_paragraph_text(p) for p in tc.iterchildren(W_P)))
+                    if len(text) < 256:
+                        text = sys.intern(text)
+                    seen_cells[tc] = text
+                cell_texts.append(text)
+            row_text = " | ".join(cell_texts)
+            rows_cells.append(cell_texts)
+            row_texts.append(row_text)
+            row_lowers.append(row_text.lower())
+        table_cells.append(rows_cells)
+        table_row_texts.append(row_texts)
+        table_row_lowers.append(row_lowers)
+    return DocumentSnapshot(paragraph_texts, table_cells, table_row_texts, table_row_lowers)
+
+
+def extract_metrics(
+    document: Document,
+    metric_dictionary: dict,
+    snapshot: DocumentSnapshot | None = None,
+) -> tuple[dict, list[dict], list[dict]]:
+    entries_found: list[tuple[str, int, str, str]] = []
+    latest_by_key: dict[str, int] = {}
     issues: list[dict] = []
-
-    def iter_metric_sources():
-        for idx, paragraph in enumerate(document.paragraphs):
-            raw_text = paragraph.text.strip()
-            if not raw_text:
+    snapshot = snapshot or snapshot_document(document)
+    table_cells = snapshot.table_cells
+    table_row_texts = snapshot.table_row_texts
+    table_row_lowers = snapshot.table_row_lowers
+
+    def iter_metric_sources(include_tables: bool):
+        for idx, text in enumerate(snapshot.paragraph_texts):
+            if not text:
                 continue
-            text = normalize_text(raw_text)
             yield {
                 "text": text,
+                "lowered": text.lower(),
                 "source": f"paragraph {idx + 1}",
                 "cells": None,
                 "kind": "paragraph",
             }
 
-        for t_index, table in enumerate(document.tables):
-            for r_index, row in enumerate(table.rows):
-                cell_texts = [normalize_text(cell.text) for cell in row.cells]
+        if not include_tables:
+            return
+        for t_index, rows_cells in enumerate(table_cells):
+            row_texts = table_row_texts[t_index]
+            row_lowers = table_row_lowers[t_index]
+            for r_index, cell_texts in enumerate(rows_cells):
                 if not any(cell_texts):
                     continue
-                row_text = " | ".join(cell_texts)
                 yield {
-                    "text": row_text,
+                    "text": row_texts[r_index],
+                    "lowered": row_lowers[r_index],
                     "source": f"table {t_index + 1} row {r_index + 1}",
                     "cells": cell_texts,
                     "kind": "table",
                 }
 
-    def find_number(text: str) -> str | None:
-        match = re.search(r"\b(\d[\d\s]*)\b", text)
-        return match.group(1) if match else None
-
-    for source in iter_metric_sources():
+    metric_dictionary = compile_metric_dictionary(metric_dictionary)
+    paragraph_entries = list(metric_dictionary.items())
+    table_entries = [(key, entry) for key, entry in paragraph_entries if entry.get("allowTable")]
+    paragraph_index = _metric_keyword_index(paragraph_entries)
+    table_index = _metric_keyword_index(table_entries)
+    # Table rows are only sources for allowTable metrics; skip walking them when there are none.
+    for source in iter_metric_sources(bool(table_entries)):
         text = source["text"]
-        lowered = text.lower()
+        lowered = source["lowered"]
+        if source["kind"] == "table":
+            entries, keyword_index = table_entries, table_index
+        else:
+            entries, keyword_index = paragraph_entries, paragraph_index
+        candidates = _metric_candidates(lowered, keyword_index) if entries else None
+        if not candidates:
+            continue
+        # Cells are already normalized; lower them at most once per source, and only if a phrase misses the row.
+        lowered_cells: list[str] | None = None
 
-        for key, entry in metric_dictionary.items():
-            if source["kind"] == "table" and not entry.get("allowTable"):
+        for key, entry in entries:
+            if key not in candidates:
                 continue
             found_value = None
-            for regex in entry.get("regex", []):
-                match = re.search(regex, text, re.IGNORECASE)
+            for pattern, literal in zip(entry["regex"], entry["_regex_literals"]):
+                if literal not in lowered:
+                    continue
+                match = pattern.search(text)
                 if match:
                     found_value = match.group(1)
                     break
@@ -231,14 +516,15 @@ def extract_metrics(document: Document, metric_dictionary: dict) -> tuple[dict,
             if found_value is None:
                 matched_phrase = False
                 matched_cells: list[int] = []
-                for phrase in entry.get("patterns", []):
-                    phrase_norm = normalize_lower(phrase)
+                for phrase_norm in entry["_patterns_norm"]:
                     if phrase_norm in lowered:
                         matched_phrase = True
                         break
                     if source["cells"]:
-                        for cell_index, cell_text in enumerate(source["cells"]):
-                            if phrase_norm in normalize_lower(cell_text):
+                        if lowered_cells is None:
+                            lowered_cells = [cell.lower() for cell in source["cells"]]
+                        for cell_index, cell_lower in enumerate(lowered_cells):
+                            if phrase_norm in cell_lower:
                                 matched_phrase = True
                                 matched_cells.append(cell_index)
                                 break
@@ -250,16 +536,16 @@ def extract_metrics(document: Document, metric_dictionary: dict) -> tuple[dict,
                         for cell_index, cell_text in enumerate(source["cells"]):
                             if cell_index in matched_cells:
                                 continue
-                            found_value = find_number(cell_text)
+                            found_value = _find_number(cell_text)
                             if found_value:
                                 break
                         if found_value is None:
                             for cell_text in source["cells"]:
-                                found_value = find_number(cell_text)
+                                found_value = _find_number(cell_text)
                                 if found_value:
                                     break
                     if found_value is None:
-                        found_value = find_number(text)
+                        found_value = _find_number(text)
 
             if found_value is None:
                 continue
@@ -276,7 +562,7 @@ def extract_metrics(document: Document, metric_dictionary: dict) -> tuple[dict,
                     }
                 )
                 continue
-            if key in metrics:
+            if key in latest_by_key:
                 issues.append(
                     {
                         "type": "warning",
@@ -285,50 +571,54 @@ def extract_metrics(document: Document, metric_dictionary: dict) -> tuple[dict,
                         "suggestedFix": "Verify duplicate metric blocks in the Word report.",
                     }
                 )
-            metrics[key] = {
-                "value": value,
-                "sourceSnippet": text,
-                "sourcePointer": source["source"],
-            }
+            latest_by_key[key] = len(entries_found)
+            entries_found.append((key, value, text, source["source"]))
 
-    metrics_list = [
-        {
-            "key": key,
-            "value": data["value"],
-            "sourceSnippet": data["sourceSnippet"],
-            "sourcePointer": data["sourcePointer"],
-        }
-        for key, data in metrics.items()
-    ]
+    metrics: dict[str, dict[str, Any]] = {}
+    metrics_list: list[dict] = []
+    for index in latest_by_key.values():
+        key, value, snippet, pointer = entries_found[index]
+        metrics[key] = {"value": value, "sourceSnippet": snippet, "sourcePointer": pointer}
+        metrics_list.append({"key": key, "value": value, "sourceSnippet": snippet, "sourcePointer": pointer})
 
     return metrics, metrics_list, issues
 
 
-def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict], int]:
+def extract_cases(
+    document: Document,
+    snapshot: DocumentSnapshot | None = None,
+    report_month: dict | None = None,
+) -> tuple[list[dict], list[dict], list[dict], int]:
     cases: list[dict] = []
     issues: list[dict] = []
     warnings: list[dict] = []
-    table_count = len(document.tables)
+    snapshot = snapshot or snapshot_document(document)
+    table_cells = snapshot.table_cells
+    table_row_texts = snapshot.table_row_texts
+    table_row_lowers = snapshot.table_row_lowers
+    table_count = len(table_cells)
+    month_prefix = _month_prefix(report_month)
     duplicate_case_ids: list[str] = []
     total_case_rows = 0
 
-    for t_index, table in enumerate(document.tables):
+    for t_index, rows_cells in enumerate(table_cells):
         table_seen_ids: set[str] = set()
-        for r_index, row in enumerate(table.rows):
-            cell_texts = [normalize_text(cell.text) for cell in row.cells]
+        row_texts = table_row_texts[t_index]
+        row_lowers = table_row_lowers[t_index]
+        for r_index, cell_texts in enumerate(rows_cells):
             if not any(cell_texts):
                 continue
-            row_text = " | ".join(cell_texts)
-            combined_text = " ".join(cell_texts[:6]) if len(cell_texts) >= 6 else row_text
+            row_text = row_texts[r_index]
+            combined_text = None
 
+            # Case id and outcome patterns cannot span the " | " cell separator, so the
+            # leftmost row match is the first matching cell's match.
             case_id = None
             case_col = None
-            for c_index, cell_text in enumerate(cell_texts):
-                match = CASE_ID_PATTERN.search(cell_text)
-                if match:
-                    case_id = match.group(1)
-                    case_col = c_index
-                    break
+            match = CASE_ID_PATTERN.search(row_text)
+            if match:
+                case_id = match.group(1)
+                case_col = _cell_index_at(cell_texts, match.start())
             if case_id is None:
                 match = ALT_CASE_ID_PATTERN.search(row_text)
                 if match:
@@ -336,12 +626,10 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict
                     case_col = None
 
             if case_id is None:
-                for c_index, cell_text in enumerate(cell_texts):
-                    match = FALLBACK_CASE_ID_PATTERN.search(cell_text)
-                    if match:
-                        case_id = match.group(0)
-                        case_col = c_index
-                        break
+                match = FALLBACK_CASE_ID_PATTERN.search(row_text)
+                if match:
+                    case_id = match.group(0)
+                    case_col = _cell_index_at(cell_texts, match.start())
 
             if case_id is None:
                 continue
@@ -361,6 +649,7 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict
                     date_col = c_index
                     break
             if registered_date is None:
+                combined_text = " ".join(cell_texts[:6]) if len(cell_texts) >= 6 else row_text
                 parsed = parse_date_from_text(combined_text)
                 if parsed:
                     registered_date = parsed
@@ -368,36 +657,36 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict
             article_match = None
             article_col = None
             article_match_kind = None
-            for c_index, cell_text in enumerate(cell_texts):
-                match = ARTICLE_PATTERN.search(cell_text)
-                if match:
-                    article_match = match
-                    article_col = c_index
-                    article_match_kind = "std"
-                    break
-            if article_match is None:
+            # Cells are joined with " | ", which no article pattern can span, so a row-level
+            # search finds the leftmost cell match; a leftmost "std" match needs no per-cell scan.
+            row_match = ARTICLE_CELL_PATTERN.search(row_text)
+            if row_match and row_match.lastgroup == "std":
+                article_match = row_match
+                article_col = _cell_index_at(cell_texts, row_match.start())
+                article_match_kind = "std"
+            elif row_match:
+                # std beats УК beats бер across the whole row, so every match in a cell counts,
+                # not just its leftmost one; the first cell holding the best kind wins.
                 for c_index, cell_text in enumerate(cell_texts):
-                    match = ARTICLE_UK_PATTERN.search(cell_text)
-                    if match:
-                        article_match = match
-                        article_col = c_index
-                        article_match_kind = "uk"
-                        break
-            if article_match is None:
-                for c_index, cell_text in enumerate(cell_texts):
-                    match = ARTICLE_KG_PATTERN.search(cell_text)
-                    if match:
-                        article_match = match
-                        article_col = c_index
-                        article_match_kind = "kg"
+                    for match in ARTICLE_CELL_PATTERN.finditer(cell_text):
+                        kind = match.lastgroup
+                        if article_match_kind is None or ARTICLE_KIND_RANK[kind] < ARTICLE_KIND_RANK[article_match_kind]:
+                            article_match = match
+                            article_col = c_index
+                            article_match_kind = kind
+                            if kind == "std":
+                                break
+                    if article_match_kind == "std":
                         break
             if article_match is None:
+                if combined_text is None:
+                    combined_text = " ".join(cell_texts[:6]) if len(cell_texts) >= 6 else row_text
                 match = ARTICLE_GENERIC_PATTERN.search(combined_text)
                 if match:
                     article_match = match
                     article_col = None
                     article_match_kind = "generic"
-            if article_match is None:
+            if article_match is None and combined_text is not row_text:
                 match = ARTICLE_GENERIC_PATTERN.search(row_text)
                 if match:
                     article_match = match
@@ -428,20 +717,17 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict
             article_suffix = ""
             article_display = ""
             if article_match:
-                article_base = article_match.group(1)
-                if article_match_kind in {"std", "uk"}:
-                    if article_match.group(2):
-                        article_suffix += f"-{article_match.group(2)}"
-                    if article_match.group(3):
-                        article_suffix += f" ч.{article_match.group(3)}"
-                elif article_match_kind == "kg":
-                    if article_match.group(2):
-                        article_suffix += f" ч.{article_match.group(2)}"
-                elif article_match_kind == "generic":
-                    if article_match.group(2):
-                        article_suffix += f"-{article_match.group(2)}"
-                    if article_match.group(3):
-                        article_suffix += f" ч.{article_match.group(3)}"
+                if article_match_kind == "generic":
+                    article_base, article_ext, article_part = article_match.groups()
+                else:
+                    groups = article_match.groupdict()
+                    article_base = groups[f"{article_match_kind}_base"]
+                    article_ext = groups.get(f"{article_match_kind}_ext")
+                    article_part = groups[f"{article_match_kind}_part"]
+                if article_ext:
+                    article_suffix += f"-{article_ext}"
+                if article_part:
+                    article_suffix += f" ч.{article_part}"
                 article_display = f"ст.{article_base}{article_suffix}"
 
             outcome_text = ""
@@ -450,30 +736,22 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict
                 outcome_text = cell_texts[6]
                 outcome_col = 6
             else:
-                for c_index, cell_text in enumerate(cell_texts):
-                    lowered = cell_text.lower()
-                    if "токт" in lowered or "246-" in lowered or "прокур" in lowered:
-                        outcome_text = cell_text
-                        outcome_col = c_index
-                        break
+                match = OUTCOME_HINT_PATTERN.search(row_text)
+                if match:
+                    outcome_col = _cell_index_at(cell_texts, match.start())
+                    outcome_text = cell_texts[outcome_col]
                 if not outcome_text:
                     outcome_text = row_text
 
-            description_text = " ".join(cell_texts[2:4]) if len(cell_texts) >= 4 else row_text
-            normalized_desc = normalize_lower(description_text)
-            women_tag = any(tag in normalized_desc for tag in WOMEN_TAGS)
-            minor_tag = any(tag in normalized_desc for tag in MINOR_TAGS)
+            normalized_desc = " ".join(cell_texts[2:4]).lower() if len(cell_texts) >= 4 else row_lowers[r_index]
+            women_tag = any(stem in normalized_desc for stem in WOMEN_TAG_STEMS)
+            minor_tag = any(stem in normalized_desc for stem in MINOR_TAG_STEMS)
 
-            sources = []
-            for c_index, cell_text in enumerate(cell_texts):
-                sources.append(
-                    {
-                        "table_index": t_index + 1,
-                        "row_index": r_index + 1,
-                        "col_index": c_index + 1,
-                        "text": cell_text,
-                    }
-                )
+            # (table_index, row_index, col_index, text), same fields as SourcePointer.
+            sources = [
+                (t_index + 1, r_index + 1, c_index + 1, cell_text)
+                for c_index, cell_text in enumerate(cell_texts)
+            ]
 
             cases.append(
                 {
@@ -513,6 +791,7 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict
                     },
                 }
             )
+            _flag_case(cases[-1], report_month, month_prefix, outcome_normalized=True)
 
     if table_count == 0:
         issues.append(
@@ -540,98 +819,105 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict], list[dict
     return cases, issues, warnings, table_count
 
 
-def apply_case_flags(cases: list[dict], report_month: dict | None) -> list[dict]:
-    for case in cases:
-        reg_date = None
-        if case.get("registered_date"):
-            try:
-                year, month, day = case["registered_date"].split("-")
-                reg_date = date(int(year), int(month), int(day))
-            except ValueError:
-                reg_date = None
-
-        is_new = False
-        if reg_date and report_month:
-            is_new = reg_date.year == report_month["year"] and reg_date.month == report_month["month"]
-
-        normalized_outcome = normalize_lower(case.get("outcome", ""))
-        has_stop_word = any(word in normalized_outcome for word in STOP_WORDS)
-        has_246 = "246-" in normalized_outcome
-        stop_date_match = parse_date_from_text(case.get("outcome", ""))
-        stop_in_month = False
-        if stop_date_match and report_month:
+def _month_prefix(report_month: dict | None) -> str | None:
+    if not report_month:
+        return None
+    return f"{report_month['year']:04d}-{report_month['month']:02d}-"
+
+
+def _flag_case(
+    case: dict,
+    report_month: dict | None,
+    month_prefix: str | None,
+    outcome_normalized: bool = False,
+) -> None:
+    registered_date = case.get("registered_date")
+    is_new = bool(month_prefix and registered_date and registered_date.startswith(month_prefix))
+
+    outcome = case.get("outcome", "")
+    # Outcomes taken from snapshot cells are already normalized and only need lowering.
+    normalized_outcome = outcome.lower() if outcome_normalized else normalize_lower(outcome)
+    has_stop_word = any(stem in normalized_outcome for stem in STOP_WORD_STEMS)
+    has_246 = "246-" in normalized_outcome
+    stop_in_month = False
+    # The outcome date only matters for a 246- outcome without a stop word.
+    if has_246 and not has_stop_word and report_month:
+        stop_date_match = parse_date_from_text(outcome)
+        if stop_date_match:
             stop_in_month = (
                 stop_date_match.year == report_month["year"]
                 and stop_date_match.month == report_month["month"]
             )
-        is_stopped = has_stop_word or (has_246 and stop_in_month)
+    is_stopped = has_stop_word or (has_246 and stop_in_month)
 
-        case["is_new"] = is_new
-        case["is_stopped"] = is_stopped
+    case["is_new"] = is_new
+    case["is_stopped"] = is_stopped
 
-    return cases
-
-
-def build_article_breakdown(cases: list[dict], report_month: dict | None) -> list[dict]:
-    breakdown: dict[str, dict[str, int]] = {}
-
-    for case in cases:
-        if report_month and case.get("registered_date"):
-            try:
-                year, month, day = case["registered_date"].split("-")
-                reg_date = date(int(year), int(month), int(day))
-                if reg_date.year != report_month["year"] or reg_date.month != report_month["month"]:
-                    continue
-            except ValueError:
-                pass
-        base = case.get("article_base")
-        if not base:
-            continue
-        key = f"ст.{base}"
-        if key not in breakdown:
-            breakdown[key] = {
-                "women_u18": 0,
-                "women_ge18": 0,
-                "women_total": 0,
-                "stopped": 0,
-                "new": 0,
-                "total_cases": 0,
-            }
-
-        row = breakdown[key]
-        tags = case.get("tags", {})
-        women = tags.get("women", False)
-        minor = tags.get("minor", False)
-        if women and minor:
-            row["women_u18"] += 1
-        if women and not minor:
-            row["women_ge18"] += 1
-        if women:
-            row["women_total"] += 1
-        if case.get("is_stopped"):
-            row["stopped"] += 1
-        if case.get("is_new"):
-            row["new"] += 1
-        row["total_cases"] += 1
 
+def _count_case(breakdown: dict[str, list[int]], case: dict, month_prefix: str | None) -> None:
+    registered_date = case.get("registered_date")
+    if month_prefix and registered_date and not registered_date.startswith(month_prefix):
+        try:
+            date.fromisoformat(registered_date)
+            return
+        except ValueError:
+            pass
+    base = case.get("article_base")
+    if not base:
+        return
+    key = f"ст.{base}"
+    row = breakdown.get(key)
+    if row is None:
+        row = breakdown[key] = [0] * len(BREAKDOWN_FIELDS)
+
+    # Counters are indexed in BREAKDOWN_FIELDS order.
+    tags = case.get("tags", {})
+    if tags.get("women", False):
+        row[0 if tags.get("minor", False) else 1] += 1
+        row[2] += 1
+    if case.get("is_stopped"):
+        row[3] += 1
+    if case.get("is_new"):
+        row[4] += 1
+    row[5] += 1
+
+
+def _breakdown_rows(breakdown: dict[str, list[int]]) -> list[dict]:
     return [
         {
             "article": key,
-            **values,
+            **dict(zip(BREAKDOWN_FIELDS, values)),
         }
         for key, values in sorted(breakdown.items())
     ]
 
 
+def apply_case_flags(cases: list[dict], report_month: dict | None) -> list[dict]:
+    month_prefix = _month_prefix(report_month)
+    for case in cases:
+        _flag_case(case, report_month, month_prefix)
+    return cases
+
+
+def build_article_breakdown(cases: list[dict], report_month: dict | None) -> list[dict]:
+    breakdown: dict[str, list[int]] = {}
+    month_prefix = _month_prefix(report_month)
+    for case in cases:
+        _count_case(breakdown, case, month_prefix)
+    return _breakdown_rows(breakdown)
+
+
 def extract_word_data(docx_path: str, metric_dictionary: dict) -> dict:
+    # Normalization caches are kept for a single document's extraction pass.
+    clear_caches()
     document = Document(docx_path)
-    paragraph_texts = [normalize_text(p.text) for p in document.paragraphs if p.text.strip()]
+    snapshot = snapshot_document(document)
 
-    report_month = parse_report_month(paragraph_texts)
+    # The month heading sits near the top; the generator stops at the first match.
+    report_month = parse_report_month(text for text in snapshot.paragraph_texts if text)
 
-    metrics, metrics_list, metric_issues = extract_metrics(document, metric_dictionary)
-    cases, case_issues, warnings, table_count = extract_cases(document)
-    cases = apply_case_flags(cases, report_month)
+    metrics, metrics_list, metric_issues = extract_metrics(document, metric_dictionary, snapshot)
+    cases, case_issues, warnings, table_count = extract_cases(document, snapshot, report_month)
     article_breakdown = build_article_breakdown(cases, report_month)
 
     return {
@@ -645,3 +931,36 @@ def extract_word_data(docx_path: str, metric_dictionary: dict) -> dict:
         "table_count": table_count,
         "article_breakdown": article_breakdown,
     }
+
+
+_worker_metric_dictionary: dict | None = None
+
+
+def _init_batch_worker(metric_dictionary: dict) -> None:
+    global _worker_metric_dictionary
+    _worker_metric_dictionary = metric_dictionary
+
+
+def _extract_word_data_worker(docx_path: str) -> dict:
+    return extract_word_data(docx_path, _worker_metric_dictionary)
+
+
+def extract_word_data_batch(
+    paths: list[str],
+    metric_dictionary: dict,
+    num_workers: int | None = None,
+) -> list[dict]:
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, 8)
+    num_workers = min(num_workers, len(paths))
+    # Compile once for the whole batch; extract_metrics reuses an already compiled dictionary.
+    metric_dictionary = compile_metric_dictionary(metric_dictionary)
+    if num_workers <= 1:
+        return [extract_word_data(path, metric_dictionary) for path in paths]
+
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        initializer=_init_batch_worker,
+        initargs=(metric_dictionary,),
+    ) as executor:
+        return list(executor.map(_extract_word_data_worker, paths))
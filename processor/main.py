@@ -4,6 +4,8 @@ import argparse
 import json
 from pathlib import Path
 
+from openpyxl import load_workbook
+
 from config_loader import (
     load_article_map,
     load_cross_checks,
@@ -69,6 +71,8 @@ def main():
     cross_checks = load_cross_checks()
 
     word_data = extract_word_data(args.word, metric_dictionary)
+    # Only generate writes the template; analyze lets plan_updates stream it read-only.
+    workbook = load_workbook(args.excel) if args.command == "generate" else None
 
     validation = validate_report(
         report_month=word_data["report_month"],
@@ -88,6 +92,7 @@ def main():
         word_data["article_breakdown"],
         excel_map,
         article_map,
+        workbook=workbook,
     )
 
     if plan_errors:
@@ -154,6 +159,7 @@ def main():
             excel_hash=excel_hash,
             counts=counts,
             summary=summary,
+            workbook=workbook,
         )
 
     print(
@@ -1,11 +1,15 @@
 ﻿from __future__ import annotations
 
+import re
 import sys
+import zipfile
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+import pytest
+from docx import Document
 from openpyxl import load_workbook
 
 from config_loader import (
@@ -15,9 +19,17 @@ from config_loader import (
     load_metric_dictionary,
     load_required_metrics,
 )
-from extract_word import extract_word_data
+from extract_word import (
+    W_P,
+    _paragraph_text,
+    extract_cases,
+    extract_word_data,
+    extract_word_data_batch,
+    normalize_text,
+    snapshot_document,
+)
 from update_excel import apply_updates, find_row_by_label, plan_updates
-from validate import validate_report
+from validate import FormulaError, safe_eval, validate_report
 from .fixtures_factory import create_sample_docx, create_sample_docx_missing_metric, create_sample_xlsx
 
 
@@ -108,3 +120,143 @@ def test_apply_updates_changes_cells(tmp_path: Path):
     assert article_row is not None
     assert ws.cell(row=article_row, column=19).value == 1
 
+
+def test_apply_updates_reuses_planned_workbook(tmp_path: Path):
+    word_path = tmp_path / "sample.docx"
+    excel_path = tmp_path / "sample.xlsx"
+    output_path = tmp_path / "output.xlsx"
+    create_sample_docx(word_path)
+    create_sample_xlsx(excel_path)
+
+    word_data = extract_word_data(str(word_path), load_metric_dictionary())
+    workbook = load_workbook(excel_path)
+    updates, plan_errors = plan_updates(
+        str(excel_path),
+        word_data["metrics"],
+        word_data["article_breakdown"],
+        load_excel_map(),
+        load_article_map(),
+        workbook=workbook,
+    )
+    assert plan_errors == []
+
+    apply_updates(
+        str(excel_path),
+        str(output_path),
+        updates,
+        report_month=word_data["report_month"],
+        word_hash="hash",
+        excel_hash="hash",
+        counts={"metrics": 1, "cases": 1, "articles": 1},
+        summary="test",
+        workbook=workbook,
+    )
+
+    ws = load_workbook(output_path)["Отчет 1-Е Р.2"]
+    for update in updates:
+        assert ws.cell(row=update["row"], column=update["col"]).value == update["newValue"]
+
+
+def test_plan_updates_ignores_stale_dimension(tmp_path: Path):
+    word_path = tmp_path / "sample.docx"
+    excel_path = tmp_path / "sample.xlsx"
+    stale_path = tmp_path / "stale.xlsx"
+    create_sample_docx(word_path)
+    create_sample_xlsx(excel_path)
+    with zipfile.ZipFile(excel_path) as source, zipfile.ZipFile(stale_path, "w") as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb'<dimension ref="[^"]*"/>', b'<dimension ref="A1"/>', data)
+            target.writestr(item, data)
+
+    word_data = extract_word_data(str(word_path), load_metric_dictionary())
+    plans = [
+        plan_updates(
+            str(path),
+            word_data["metrics"],
+            word_data["article_breakdown"],
+            load_excel_map(),
+            load_article_map(),
+        )
+        for path in (excel_path, stale_path)
+    ]
+    assert plans[0][1] == []
+    assert plans[1] == plans[0]
+
+
+def test_extract_word_data_batch_matches_single(tmp_path: Path):
+    first_path = tmp_path / "first.docx"
+    second_path = tmp_path / "second.docx"
+    create_sample_docx(first_path)
+    create_sample_docx_missing_metric(second_path)
+    metric_dictionary = load_metric_dictionary()
+
+    results = extract_word_data_batch([str(first_path), str(second_path)], metric_dictionary, num_workers=2)
+
+    assert results == [
+        extract_word_data(str(first_path), metric_dictionary),
+        extract_word_data(str(second_path), metric_dictionary),
+    ]
+
+
+def test_snapshot_document_matches_python_docx(tmp_path: Path):
+    document = Document()
+    paragraph = document.add_paragraph("ЕРП № 123")
+    run = paragraph.add_run("после")
+    run.add_tab()
+    run.add_break()
+    run.add_text("строки")
+    table = document.add_table(rows=4, cols=4)
+    for r_index, row in enumerate(table.rows):
+        for c_index, cell in enumerate(row.cells):
+            cell.text = f"r{r_index} c{c_index}"
+    table.cell(0, 0).merge(table.cell(2, 1))
+    table.cell(1, 2).merge(table.cell(1, 3))
+    table.cell(2, 3).merge(table.cell(3, 3))
+    path = tmp_path / "merged.docx"
+    document.save(str(path))
+    document = Document(str(path))
+
+    snapshot = snapshot_document(document)
+
+    assert [_paragraph_text(p) for p in document.element.body.iterchildren(W_P)] == [
+        p.text for p in document.paragraphs
+    ]
+    assert snapshot.paragraph_texts == [normalize_text(p.text) for p in document.paragraphs]
+    assert snapshot.table_cells == [
+        [[normalize_text(cell.text) for cell in row.cells] for row in table.rows]
+        for table in document.tables
+    ]
+
+
+def test_extract_cases_article_kind_precedence(tmp_path: Path):
+    document = Document()
+    table = document.add_table(rows=3, cols=3)
+    rows = [
+        ("ЕРП № 111", "158 УК, ст. 41", "01.12.2025"),
+        ("ЕРП № 222", "12 бер, 130 УК", "01.12.2025"),
+        ("ЕРП № 333", "12 бер", "ст. 7"),
+    ]
+    for row, texts in zip(table.rows, rows):
+        for cell, text in zip(row.cells, texts):
+            cell.text = text
+    path = tmp_path / "articles.docx"
+    document.save(str(path))
+
+    cases, _, _, _ = extract_cases(Document(str(path)))
+
+    assert [(case["case_id"], case["article_display"]) for case in cases] == [
+        ("111", "ст.41"),
+        ("222", "ст.130"),
+        ("333", "ст.7"),
+    ]
+
+
+def test_safe_eval_compiled_formula():
+    values = {"carry_over_cases": 10, "initiated_cases": 5, "terminated_cases": 2}
+
+    assert safe_eval("carry_over_cases + initiated_cases - (terminated_cases + missing)", values) == 13
+    assert safe_eval("-carry_over_cases + 2.9", values) == -8
+    with pytest.raises(FormulaError):
+        safe_eval("carry_over_cases * 2", values)
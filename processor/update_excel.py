@@ -1,74 +1,134 @@
 ﻿from __future__ import annotations
 
+import functools
 import hashlib
+import itertools
+import operator
 from datetime import datetime
 from typing import Any
 
 import re
 
 from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+
+LABEL_TRANSLATION = str.maketrans({"\u00a0": " ", "–": "-", "—": "-"})
+SHEET_NAME_TRANSLATION = str.maketrans({"\u00a0": " ", "–": "-", "—": "-", "Ё": "е", "ё": "е"})
+SHEET_NAME_NOISE_PATTERN = re.compile(r"[\s\.-]+")
+
+
+# Labels and headers repeat across rows, sheets and lookups, so normalized forms are cached.
+@functools.lru_cache(maxsize=4096)
+def _normalize_label_str(label: str) -> str:
+    return "".join(label.translate(LABEL_TRANSLATION).lower().split())
 
 
 def normalize_label(label: str) -> str:
     if label is None:
         return ""
-    cleaned = (
-        str(label)
-        .replace("\u00a0", " ")
-        .replace("–", "-")
-        .replace("—", "-")
-        .strip()
-        .lower()
-    )
-    return "".join(cleaned.split())
+    return _normalize_label_str(str(label))
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_sheet_name_str(name: str) -> str:
+    return SHEET_NAME_NOISE_PATTERN.sub("", name.translate(SHEET_NAME_TRANSLATION).lower())
 
 
 def normalize_sheet_name(name: str) -> str:
     if name is None:
         return ""
-    cleaned = (
-        str(name)
-        .replace("\u00a0", " ")
-        .replace("–", "-")
-        .replace("—", "-")
-        .strip()
-        .lower()
-    )
-    cleaned = cleaned.replace("ё", "е")
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return re.sub(r"[\s\.-]+", "", cleaned)
+    return _normalize_sheet_name_str(str(name))
 
 
-def resolve_sheet_name(workbook, desired: str) -> str | None:
+def build_sheet_index(workbook) -> dict[str, list[str]]:
+    index: dict[str, list[str]] = {}
+    for name in workbook.sheetnames:
+        index.setdefault(normalize_sheet_name(name), []).append(name)
+    return index
+
+
+def resolve_sheet_name(workbook, desired: str, sheet_index: dict[str, list[str]] | None = None) -> str | None:
     if desired in workbook.sheetnames:
         return desired
+    if sheet_index is None:
+        sheet_index = build_sheet_index(workbook)
     target = normalize_sheet_name(desired)
+    if target in sheet_index:
+        return sheet_index[target][0]
     partial_matches = []
-    for name in workbook.sheetnames:
-        normalized = normalize_sheet_name(name)
-        if normalized == target:
-            return name
-        if target and (normalized.endswith(target) or target.endswith(normalized) or target in normalized):
-            partial_matches.append(name)
+    if target:
+        for normalized, names in sheet_index.items():
+            if normalized.endswith(target) or target.endswith(normalized) or target in normalized:
+                partial_matches.extend(names)
     if len(partial_matches) == 1:
         return partial_matches[0]
     return None
 
 
+def normalize_column(ws, col_letter: str = "B") -> list[str]:
+    col_index = column_index_from_string(col_letter)
+    return [
+        normalize_label(value)
+        for (value,) in ws.iter_rows(
+            min_row=1, max_row=ws.max_row, min_col=col_index, max_col=col_index, values_only=True
+        )
+    ]
+
+
+def build_label_index(normalized_labels: list[str]) -> dict[str, list[int]]:
+    index: dict[str, list[int]] = {}
+    for row, normalized_value in enumerate(normalized_labels, start=1):
+        index.setdefault(normalized_value, []).append(row)
+    return index
+
+
+def _cached_label_column(label_indexes: dict, ws, col_letter: str) -> tuple[list[str], dict[str, list[int]]]:
+    key = (ws.title, col_letter.upper())
+    if key not in label_indexes:
+        normalized_labels = normalize_column(ws, col_letter)
+        label_indexes[key] = (normalized_labels, build_label_index(normalized_labels))
+    return label_indexes[key]
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_label_regex(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
 def find_row_by_label(
     ws,
     label: str | None,
     col_letter: str = "B",
     label_contains: str | None = None,
     label_regex: str | None = None,
+    label_index: dict[str, list[int]] | None = None,
+    normalized_labels: list[str] | None = None,
 ) -> int | None:
     target = normalize_label(label) if label else ""
     contains_target = normalize_label(label_contains) if label_contains else ""
-    regex = re.compile(label_regex, re.IGNORECASE) if label_regex else None
+    # Exact and contains lookups can reuse a prebuilt index or normalized column; regex needs raw values.
+    if label_index is not None and not contains_target and not label_regex:
+        matches = label_index.get(target, []) if target else []
+        if len(matches) > 1:
+            raise ValueError(f"Multiple rows matched label '{label}' in sheet {ws.title}.")
+        return matches[0] if matches else None
+    if normalized_labels is not None and not label_regex:
+        matches = [
+            row
+            for row, normalized_value in enumerate(normalized_labels, start=1)
+            if (contains_target and contains_target in normalized_value) or (target and normalized_value == target)
+        ]
+        if len(matches) > 1:
+            raise ValueError(f"Multiple rows matched label '{label}' in sheet {ws.title}.")
+        return matches[0] if matches else None
+    regex = _compile_label_regex(label_regex) if label_regex else None
+    col_index = column_index_from_string(col_letter)
     matches = []
-    for row in range(1, ws.max_row + 1):
-        value = ws[f"{col_letter}{row}"].value
+    for row, (value,) in enumerate(
+        ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=col_index, max_col=col_index, values_only=True),
+        start=1,
+    ):
         normalized_value = normalize_label(value)
         if regex and value is not None and regex.search(str(value)):
             matches.append(row)
@@ -84,17 +144,53 @@ def find_row_by_label(
 def find_column_by_header(ws, header: str, header_row: int | None = None) -> int | None:
     target = normalize_label(header)
     rows_to_scan = [header_row] if header_row else range(1, 6)
+    max_column = ws.max_column
     for row in rows_to_scan:
-        for col in range(1, ws.max_column + 1):
-            value = ws.cell(row=row, column=col).value
-            if normalize_label(value) == target:
-                return col
+        for values in ws.iter_rows(min_row=row, max_row=row, max_col=max_column, values_only=True):
+            for col, value in enumerate(values, start=1):
+                if normalize_label(value) == target:
+                    return col
     return None
 
 
-def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[dict], list[dict]]:
+def _old_value(workbook, ws, row: int, col: int):
+    # Random cell access re-streams a read-only sheet, so plan_updates fills these in one pass instead.
+    if workbook.read_only:
+        return None
+    return ws.cell(row=row, column=col).value
+
+
+def _read_old_values(workbook, updates: list[dict]) -> None:
+    sheet_index = build_sheet_index(workbook)
+    by_sheet: dict[str, list[dict]] = {}
+    for update in updates:
+        by_sheet.setdefault(resolve_sheet_name(workbook, update["sheet"], sheet_index), []).append(update)
+    for sheet_name, sheet_updates in by_sheet.items():
+        ws = workbook[sheet_name]
+        rows = list(
+            ws.iter_rows(
+                min_row=1,
+                max_row=max(update["row"] for update in sheet_updates),
+                max_col=max(update["col"] for update in sheet_updates),
+                values_only=True,
+            )
+        )
+        for update in sheet_updates:
+            values = rows[update["row"] - 1] if update["row"] <= len(rows) else ()
+            update["oldValue"] = values[update["col"] - 1] if update["col"] <= len(values) else None
+
+
+def plan_metric_updates(
+    workbook,
+    metrics: dict,
+    excel_map: dict,
+    label_indexes: dict | None = None,
+) -> tuple[list[dict], list[dict]]:
     updates = []
     errors = []
+    if label_indexes is None:
+        label_indexes = {}
+    sheet_index = build_sheet_index(workbook)
 
     for metric_key, mapping in excel_map.items():
         if metric_key not in metrics:
@@ -104,7 +200,7 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
         col = mapping.get("col")
         header_row = mapping.get("headerRow")
 
-        resolved_sheet = resolve_sheet_name(workbook, sheet_name)
+        resolved_sheet = resolve_sheet_name(workbook, sheet_name, sheet_index)
         if not resolved_sheet:
             errors.append(
                 {
@@ -117,13 +213,17 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
             continue
 
         ws = workbook[resolved_sheet]
+        row_label_column = mapping.get("rowLabelColumn", "B")
+        normalized_labels, label_index = _cached_label_column(label_indexes, ws, row_label_column)
         try:
             row = find_row_by_label(
                 ws,
                 row_label,
-                col_letter=mapping.get("rowLabelColumn", "B"),
+                col_letter=row_label_column,
                 label_contains=mapping.get("rowLabelContains"),
                 label_regex=mapping.get("rowLabelRegex"),
+                label_index=label_index,
+                normalized_labels=normalized_labels,
             )
         except ValueError as exc:
             errors.append(
@@ -162,13 +262,12 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
             )
             continue
 
-        cell = ws.cell(row=row, column=col_index)
         updates.append(
             {
                 "sheet": sheet_name,
                 "cell": f"{get_column_letter(col_index)}{row}",
                 "rowLabel": row_label,
-                "oldValue": cell.value,
+                "oldValue": _old_value(workbook, ws, row, col_index),
                 "newValue": metrics[metric_key]["value"],
                 "kind": metric_key,
                 "row": row,
@@ -179,9 +278,16 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
     return updates, errors
 
 
-def plan_article_updates(workbook, article_breakdown: list[dict], article_map: dict) -> tuple[list[dict], list[dict]]:
+def plan_article_updates(
+    workbook,
+    article_breakdown: list[dict],
+    article_map: dict,
+    label_indexes: dict | None = None,
+) -> tuple[list[dict], list[dict]]:
     updates = []
     errors = []
+    if label_indexes is None:
+        label_indexes = {}
 
     sheet_name = article_map.get("sheet")
     if not sheet_name:
@@ -202,10 +308,11 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
     ws = workbook[resolved_sheet]
     row_label_column = article_map.get("rowLabelColumn", "B")
     columns = article_map.get("columns", {})
+    normalized_labels, label_index = _cached_label_column(label_indexes, ws, row_label_column)
 
     for row in article_breakdown:
         article = row.get("article")
-        if not article:
+        if not article or not any(key in row for key in columns):
             continue
         try:
             excel_row = find_row_by_label(
@@ -214,6 +321,8 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
                 col_letter=row_label_column,
                 label_contains=article_map.get("rowLabelContains"),
                 label_regex=article_map.get("rowLabelRegex"),
+                label_index=label_index,
+                normalized_labels=normalized_labels,
             )
         except ValueError as exc:
             errors.append(
@@ -240,13 +349,12 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
         for key, col_index in columns.items():
             if key not in row:
                 continue
-            cell = ws.cell(row=excel_row, column=col_index)
             updates.append(
                 {
                     "sheet": sheet_name,
                     "cell": f"{get_column_letter(col_index)}{excel_row}",
                     "rowLabel": article,
-                    "oldValue": cell.value,
+                    "oldValue": _old_value(workbook, ws, excel_row, col_index),
                     "newValue": row[key],
                     "kind": f"article_{key}",
                     "row": excel_row,
@@ -257,13 +365,36 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
     return updates, errors
 
 
-def plan_updates(excel_path: str, metrics: dict, article_breakdown: list[dict], excel_map: dict, article_map: dict):
-    workbook = load_workbook(excel_path)
-    metric_updates, metric_errors = plan_metric_updates(workbook, metrics, excel_map)
-    article_updates, article_errors = plan_article_updates(workbook, article_breakdown, article_map)
-
-    updates = metric_updates + article_updates
-    errors = metric_errors + article_errors
+def plan_updates(
+    excel_path: str,
+    metrics: dict,
+    article_breakdown: list[dict],
+    excel_map: dict,
+    article_map: dict,
+    workbook=None,
+):
+    # Planning never writes, so without a caller-supplied workbook the template is streamed read-only.
+    owns_workbook = workbook is None
+    if owns_workbook:
+        workbook = load_workbook(excel_path, read_only=True)
+    try:
+        if workbook.read_only:
+            # A read-only sheet sizes itself from the <dimension> tag, which producers often omit or get
+            # wrong; dropping it makes every scan stream the sheet to its real last row and column.
+            for ws in workbook.worksheets:
+                ws.reset_dimensions()
+        # Metric and article lookups often share a sheet, so they share its label indexes.
+        label_indexes: dict = {}
+        metric_updates, metric_errors = plan_metric_updates(workbook, metrics, excel_map, label_indexes)
+        article_updates, article_errors = plan_article_updates(workbook, article_breakdown, article_map, label_indexes)
+
+        updates = metric_updates + article_updates
+        errors = metric_errors + article_errors
+        if workbook.read_only:
+            _read_old_values(workbook, updates)
+    finally:
+        if owns_workbook:
+            workbook.close()
 
     return updates, errors
 
@@ -311,10 +442,14 @@ def append_import_log(
 
 
 def sha256_file(path: str) -> str:
-    digest = hashlib.sha256()
     with open(path, "rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            digest.update(chunk)
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        buffer = bytearray(1 << 20)
+        view = memoryview(buffer)
+        while size := handle.readinto(buffer):
+            digest.update(view[:size])
     return digest.hexdigest()
 
 
@@ -327,11 +462,18 @@ def apply_updates(
     excel_hash: str,
     counts: dict[str, int],
     summary: str,
+    workbook=None,
 ) -> None:
-    workbook = load_workbook(excel_path)
-    for update in updates:
-        ws = workbook[update["sheet"]]
-        ws.cell(row=update["row"], column=update["col"], value=update["newValue"])
+    # Planning only reads cells, so a workbook already loaded for plan_updates can be reused here.
+    if workbook is None:
+        workbook = load_workbook(excel_path)
+    # sorted() is stable, so repeated writes to one cell keep their planned order.
+    for sheet_name, sheet_updates in itertools.groupby(
+        sorted(updates, key=operator.itemgetter("sheet")), key=operator.itemgetter("sheet")
+    ):
+        ws = workbook[sheet_name]
+        for update in sheet_updates:
+            ws.cell(row=update["row"], column=update["col"], value=update["newValue"])
 
     append_import_log(
         workbook,
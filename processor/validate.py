@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 import ast
+import functools
 from datetime import datetime
 from typing import Any
 
@@ -9,36 +10,37 @@ class FormulaError(Exception):
     pass
 
 
-def safe_eval(expression: str, values: dict[str, int]) -> int:
-    tree = ast.parse(expression, mode="eval")
-
-    def eval_node(node: ast.AST) -> int:
-        if isinstance(node, ast.Expression):
-            return eval_node(node.body)
-        if isinstance(node, ast.BinOp):
-            left = eval_node(node.left)
-            right = eval_node(node.right)
-            if isinstance(node.op, ast.Add):
-                return left + right
-            if isinstance(node.op, ast.Sub):
-                return left - right
+def _check_formula_node(node: ast.AST, names: set[str]) -> ast.AST:
+    if isinstance(node, ast.BinOp):
+        node.left = _check_formula_node(node.left, names)
+        node.right = _check_formula_node(node.right, names)
+        if not isinstance(node.op, (ast.Add, ast.Sub)):
             raise FormulaError("Unsupported operator")
-        if isinstance(node, ast.UnaryOp):
-            operand = eval_node(node.operand)
-            if isinstance(node.op, ast.USub):
-                return -operand
-            if isinstance(node.op, ast.UAdd):
-                return operand
+        return node
+    if isinstance(node, ast.UnaryOp):
+        node.operand = _check_formula_node(node.operand, names)
+        if not isinstance(node.op, (ast.USub, ast.UAdd)):
             raise FormulaError("Unsupported unary operator")
-        if isinstance(node, ast.Name):
-            return values.get(node.id, 0)
-        if isinstance(node, ast.Num):
-            return int(node.n)
-        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-            return int(node.value)
-        raise FormulaError("Unsupported expression")
+        return node
+    if isinstance(node, ast.Name):
+        names.add(node.id)
+        return node
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return ast.copy_location(ast.Constant(value=int(node.value)), node)
+    raise FormulaError("Unsupported expression")
 
-    return eval_node(tree)
+
+@functools.lru_cache(maxsize=256)
+def _compile_formula(expression: str) -> tuple[Any, tuple[str, ...]]:
+    tree = ast.parse(expression, mode="eval")
+    names: set[str] = set()
+    tree.body = _check_formula_node(tree.body, names)
+    return compile(ast.fix_missing_locations(tree), "<xcheck>", "eval"), tuple(names)
+
+
+def safe_eval(expression: str, values: dict[str, int]) -> int:
+    code, names = _compile_formula(expression)
+    return eval(code, {"__builtins__": {}}, {name: values.get(name, 0) for name in names})
 
 
 def validate_report(
@@ -78,9 +80,12 @@ def validate_report(
                 }
             )
 
+    values: dict[str, int] = {}
     for key, data in metrics.items():
         value = data.get("value")
-        if not isinstance(value, int):
+        if isinstance(value, int):
+            values[key] = value
+        else:
             errors.append(
                 {
                     "type": "error",
@@ -115,8 +120,27 @@ def validate_report(
                 }
             )
 
-    missing_date_count = sum(1 for case in cases if not case.get("registered_date"))
-    missing_article_count = sum(1 for case in cases if not case.get("article_base"))
+    missing_date_count = 0
+    missing_article_count = 0
+    out_of_month = 0
+    report_year = report_month["year"] if report_month else None
+    report_month_number = report_month["month"] if report_month else None
+    for case in cases:
+        if not case.get("article_base"):
+            missing_article_count += 1
+        date_str = case.get("registered_date")
+        if not date_str:
+            missing_date_count += 1
+            continue
+        if not report_month:
+            continue
+        try:
+            parsed = datetime.fromisoformat(date_str)
+        except ValueError:
+            continue
+        if parsed.year != report_year or parsed.month != report_month_number:
+            out_of_month += 1
+
     total_case_count = len(cases)
     if total_case_count:
         if missing_date_count / total_case_count > 0.5:
@@ -138,30 +162,17 @@ def validate_report(
                 }
             )
 
-    if report_month:
-        out_of_month = 0
-        for case in cases:
-            date_str = case.get("registered_date")
-            if not date_str:
-                continue
-            try:
-                parsed = datetime.fromisoformat(date_str)
-            except ValueError:
-                continue
-            if parsed.year != report_month["year"] or parsed.month != report_month["month"]:
-                out_of_month += 1
-        if out_of_month:
-            warnings.append(
-                {
-                    "type": "warning",
-                    "message": f"{out_of_month} cases fall outside the report month.",
-                    "source": "case tables",
-                    "suggestedFix": "Confirm whether to include non-report-month cases.",
-                }
-            )
+    if out_of_month:
+        warnings.append(
+            {
+                "type": "warning",
+                "message": f"{out_of_month} cases fall outside the report month.",
+                "source": "case tables",
+                "suggestedFix": "Confirm whether to include non-report-month cases.",
+            }
+        )
 
     cross_check_results = []
-    values = {key: data.get("value") for key, data in metrics.items() if isinstance(data.get("value"), int)}
     for target_key, expression in cross_checks.items():
         expected = values.get(target_key, 0)
         actual = None
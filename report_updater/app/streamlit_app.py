@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import io
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import streamlit as st
+from openpyxl import load_workbook
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -36,15 +44,49 @@ def save_upload(uploaded, suffix: str) -> Path:
     if not safe_name.lower().endswith(suffix):
         safe_name = f"{safe_name}{suffix}"
     path = INPUT_DIR / safe_name
-    path.write_bytes(uploaded.getbuffer())
+    path.write_bytes(uploaded.getvalue())
     return path
 
 
+# Re-running Analyze on unchanged uploads is served from cache; the file bytes are the key, paths are not hashed.
+@st.cache_data(show_spinner=False)
+def cached_extract_docx(docx_bytes: bytes, metrics_cfg: Any) -> dict:
+    # The upload is already in memory; parse it from there instead of re-reading the saved copy.
+    return extract_docx(io.BytesIO(docx_bytes), metrics_cfg)
+
+
+@st.cache_data(show_spinner=False)
+def cached_inspect_excel(excel_bytes: bytes, _excel_path: str) -> dict:
+    return inspect_excel(_excel_path)
+
+
+@st.cache_data(show_spinner=False)
+def cached_diff_template(prev_bytes: bytes, template_bytes: bytes, _prev_path: str, _template_path: str) -> list[dict]:
+    return diff_template(_prev_path, _template_path)
+
+
 def write_json(path: Path, payload: Any) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
+def load_excel_overview(analysis: dict) -> None:
+    prev_path = analysis["prev_path"]
+    template_path = analysis.get("template_path")
+    prev_bytes = Path(prev_path).read_bytes()
+    analysis["prev_inspect"] = cached_inspect_excel(prev_bytes, prev_path)
+    if template_path:
+        template_bytes = Path(template_path).read_bytes()
+        analysis["template_inspect"] = cached_inspect_excel(template_bytes, template_path)
+        analysis["template_diff"] = cached_diff_template(prev_bytes, template_bytes, prev_path, template_path)
+    else:
+        analysis["template_inspect"] = None
+        analysis["template_diff"] = []
+
+
 def render_table(title: str, rows: list[dict]) -> None:
     st.subheader(title)
     if rows:
@@ -93,9 +135,15 @@ def main() -> None:
             excel_map = load_yaml("excel_map.yaml")
             article_map = load_yaml("article_map.yaml")
 
-            extracted = extract_docx(str(docx_path), metrics_cfg)
+            extracted = cached_extract_docx(docx_file.getvalue(), metrics_cfg)
+            workbook = load_workbook(str(prev_path))
             updates, map_errors, map_warnings, map_debug = plan_updates(
-                str(prev_path), extracted["metrics"], extracted["article_breakdown"], excel_map, article_map
+                str(prev_path),
+                extracted["metrics"],
+                extracted["article_breakdown"],
+                excel_map,
+                article_map,
+                workbook=workbook,
             )
             if not updates:
                 map_errors.append(
@@ -115,10 +163,6 @@ def main() -> None:
                 map_warnings,
             )
 
-            prev_inspect = inspect_excel(str(prev_path))
-            template_inspect = inspect_excel(str(template_path)) if template_path else None
-            template_diff = diff_template(str(prev_path), str(template_path)) if template_path else []
-
             analysis = {
                 "docx_path": str(docx_path),
                 "prev_path": str(prev_path),
@@ -127,31 +171,38 @@ def main() -> None:
                 "validation": validation,
                 "updates": updates,
                 "mapping_debug": map_debug,
-                "prev_inspect": prev_inspect,
-                "template_inspect": template_inspect,
-                "template_diff": template_diff,
+                "workbook": workbook,
             }
             st.session_state["analysis"] = analysis
 
-            write_json(OUTPUT_DIR / "extracted_metrics.json", extracted)
-            write_json(OUTPUT_DIR / "validation_report.json", validation)
-            write_json(OUTPUT_DIR / "mapping_debug.json", {"updates": updates, "debug": map_debug})
+            outputs = [
+                (OUTPUT_DIR / "extracted_metrics.json", extracted),
+                (OUTPUT_DIR / "validation_report.json", validation),
+                (OUTPUT_DIR / "mapping_debug.json", {"updates": updates, "debug": map_debug}),
+            ]
+            # The three reports are independent; list() re-raises any write error here.
+            with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+                list(executor.map(lambda item: write_json(*item), outputs))
 
             st.success(i18n["analysis_done"])
 
     analysis = st.session_state.get("analysis")
     if analysis:
         st.subheader(i18n["excel_overview"])
-        st.markdown(f"**{i18n['excel_prev_title']}**")
-        st.json(analysis["prev_inspect"], expanded=False)
-        if analysis.get("template_inspect"):
-            st.markdown(f"**{i18n['excel_template_title']}**")
-            st.json(analysis["template_inspect"], expanded=False)
-            st.subheader(i18n["diff_template_title"])
-            if analysis["template_diff"]:
-                st.dataframe(analysis["template_diff"], use_container_width=True)
-            else:
-                st.info(i18n["diff_template_empty"])
+        # Inspection and template diffing re-read whole workbooks, so they only run when asked for.
+        if st.checkbox(i18n["show_excel_overview"]):
+            if "prev_inspect" not in analysis:
+                load_excel_overview(analysis)
+            st.markdown(f"**{i18n['excel_prev_title']}**")
+            st.json(analysis["prev_inspect"], expanded=False)
+            if analysis.get("template_inspect"):
+                st.markdown(f"**{i18n['excel_template_title']}**")
+                st.json(analysis["template_inspect"], expanded=False)
+                st.subheader(i18n["diff_template_title"])
+                if analysis["template_diff"]:
+                    st.dataframe(analysis["template_diff"], use_container_width=True)
+                else:
+                    st.info(i18n["diff_template_empty"])
 
         report_month = analysis["extracted"].get("report_month")
         if report_month:
@@ -179,7 +230,12 @@ def main() -> None:
                 base_name = Path(analysis["prev_path"]).stem
                 output_name = f"{base_name}_generated.xlsx"
                 output_path = OUTPUT_DIR / output_name
-                apply_updates(analysis["prev_path"], str(output_path), analysis["updates"])
+                apply_updates(
+                    analysis["prev_path"],
+                    str(output_path),
+                    analysis["updates"],
+                    workbook=analysis.get("workbook"),
+                )
                 st.success(i18n["generated"])
                 st.info(i18n["download_ready"])
                 with output_path.open("rb") as handle:
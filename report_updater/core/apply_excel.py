@@ -1,11 +1,16 @@
 ﻿from __future__ import annotations
 
 import difflib
+import functools
+import heapq
+import itertools
+import operator
+import re
 from dataclasses import dataclass
 from typing import Any
 
 from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import column_index_from_string, get_column_letter
 
 from .normalize import normalize_label, parse_int
 
@@ -19,17 +24,26 @@ class TargetResolution:
     col_header: str
 
 
-def resolve_sheet(workbook, desired: str) -> str | None:
+def build_sheet_index(workbook) -> dict[str, list[str]]:
+    index: dict[str, list[str]] = {}
+    for name in workbook.sheetnames:
+        index.setdefault(normalize_label(name), []).append(name)
+    return index
+
+
+def resolve_sheet(workbook, desired: str, sheet_index: dict[str, list[str]] | None = None) -> str | None:
     if desired in workbook.sheetnames:
         return desired
+    if sheet_index is None:
+        sheet_index = build_sheet_index(workbook)
     target = normalize_label(desired)
+    if target in sheet_index:
+        return sheet_index[target][0]
     candidates = []
-    for name in workbook.sheetnames:
-        normalized = normalize_label(name)
-        if normalized == target:
-            return name
-        if target and (normalized.endswith(target) or target.endswith(normalized) or target in normalized):
-            candidates.append(name)
+    if target:
+        for normalized, names in sheet_index.items():
+            if normalized.endswith(target) or target.endswith(normalized) or target in normalized:
+                candidates.extend(names)
     if len(candidates) == 1:
         return candidates[0]
     return None
@@ -37,21 +51,79 @@ def resolve_sheet(workbook, desired: str) -> str | None:
 
 def get_row_labels(ws, col_letter: str) -> list[tuple[int, str]]:
     labels = []
-    for row in range(1, ws.max_row + 1):
-        value = ws[f"{col_letter}{row}"].value
+    col_index = column_index_from_string(col_letter)
+    for row, (value,) in enumerate(
+        ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=col_index, max_col=col_index, values_only=True),
+        start=1,
+    ):
         if isinstance(value, str) and value.strip():
             labels.append((row, value.strip()))
     return labels
 
 
-def suggest_rows(labels: list[tuple[int, str]], target: str) -> list[dict]:
+def build_label_index(normalized_labels: list[str]) -> dict[str, list[int]]:
+    index: dict[str, list[int]] = {}
+    for position, normalized_label in enumerate(normalized_labels):
+        index.setdefault(normalized_label, []).append(position)
+    return index
+
+
+def _label_column(
+    label_columns: dict, ws, col_letter: str
+) -> tuple[list[tuple[int, str]], list[str], dict[str, list[int]]]:
+    key = (ws.title, col_letter)
+    if key not in label_columns:
+        labels = get_row_labels(ws, col_letter)
+        normalized_labels = [normalize_label(label) for _, label in labels]
+        label_columns[key] = (labels, normalized_labels, build_label_index(normalized_labels))
+    return label_columns[key]
+
+
+def _code_column(code_columns: dict, ws, col_letter: str) -> dict[int, str]:
+    key = (ws.title, col_letter)
+    if key not in code_columns:
+        col_index = column_index_from_string(col_letter)
+        code_columns[key] = {
+            row: normalize_label(value)
+            for row, (value,) in enumerate(
+                ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=col_index, max_col=col_index, values_only=True),
+                start=1,
+            )
+            if isinstance(value, str)
+        }
+    return code_columns[key]
+
+
+def suggest_rows(
+    labels: list[tuple[int, str]],
+    target: str,
+    normalized_labels: list[str] | None = None,
+) -> list[dict]:
     normalized_target = normalize_label(target)
-    scored = []
-    for row, label in labels:
-        score = difflib.SequenceMatcher(None, normalize_label(label), normalized_target).ratio()
-        scored.append((score, row, label))
-    scored.sort(reverse=True)
-    return [{"row": row, "label": label} for score, row, label in scored[:5]]
+    if normalized_labels is None:
+        normalized_labels = [normalize_label(label) for _, label in labels]
+    # The target is sequence b, whose junk/index analysis SequenceMatcher caches across set_seq1 calls.
+    matcher = difflib.SequenceMatcher(None, "", normalized_target)
+    best: list[tuple[float, int, str]] = []
+    for (row, label), normalized_label in zip(labels, normalized_labels):
+        matcher.set_seq1(normalized_label)
+        if len(best) == 5 and (matcher.real_quick_ratio() < best[0][0] or matcher.quick_ratio() < best[0][0]):
+            continue
+        scored = (matcher.ratio(), row, label)
+        if len(best) < 5:
+            heapq.heappush(best, scored)
+        elif scored > best[0]:
+            heapq.heapreplace(best, scored)
+    best.sort(reverse=True)
+    return [{"row": row, "label": label} for score, row, label in best]
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_label_regex(pattern: str) -> re.Pattern | None:
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        return None
 
 
 def find_row(
@@ -62,29 +134,55 @@ def find_row(
     row_label_column: str,
     row_code: str | None,
     row_code_column: str,
+    labels: list[tuple[int, str]] | None = None,
+    normalized_labels: list[str] | None = None,
+    suggest_on_match: bool = True,
+    label_index: dict[str, list[int]] | None = None,
+    codes: dict[int, str] | None = None,
 ) -> tuple[int | None, list[dict], int]:
-    labels = get_row_labels(ws, row_label_column)
+    if labels is None:
+        labels = get_row_labels(ws, row_label_column)
+    if normalized_labels is None:
+        normalized_labels = [normalize_label(label) for _, label in labels]
+    target_code = normalize_label(row_code) if row_code else ""
+    target_contains = normalize_label(row_label_contains) if row_label_contains else ""
+    target_label = normalize_label(row_label) if row_label else ""
+    label_regex = _compile_label_regex(row_label_regex) if row_label_regex else None
     matches = []
 
-    for row, label in labels:
+    # Exact lookups only visit the rows whose label is already known to match.
+    if label_index is not None and row_label and not row_label_regex and not row_label_contains:
+        positions = label_index.get(target_label, [])
+    else:
+        positions = range(len(labels))
+    for position in positions:
+        row, label = labels[position]
+        normalized_label = normalized_labels[position]
         if row_code:
-            code_value = ws[f"{row_code_column}{row}"].value
-            if not isinstance(code_value, str) or normalize_label(code_value) != normalize_label(row_code):
-                continue
+            if codes is not None:
+                if codes.get(row) != target_code:
+                    continue
+            else:
+                code_value = ws[f"{row_code_column}{row}"].value
+                if not isinstance(code_value, str) or normalize_label(code_value) != target_code:
+                    continue
         if row_label_regex:
-            try:
-                if row_label_regex and __import__("re").search(row_label_regex, str(label), __import__("re").IGNORECASE):
-                    matches.append((row, label))
-            except Exception:
-                continue
+            # An invalid pattern matches nothing, as when each row's search raised.
+            if label_regex is not None and label_regex.search(str(label)):
+                matches.append((row, label))
         elif row_label_contains:
-            if normalize_label(row_label_contains) in normalize_label(label):
+            if target_contains in normalized_label:
                 matches.append((row, label))
         elif row_label:
-            if normalize_label(label) == normalize_label(row_label):
+            if normalized_label == target_label:
                 matches.append((row, label))
+        # A second match already makes the lookup ambiguous, so the count is capped at 2.
+        if len(matches) > 1:
+            break
 
-    suggestions = suggest_rows(labels, row_label or row_label_contains or "")
+    if len(matches) == 1 and not suggest_on_match:
+        return matches[0][0], [], 1
+    suggestions = suggest_rows(labels, row_label or row_label_contains or "", normalized_labels)
     if len(matches) == 1:
         return matches[0][0], suggestions, 1
     if len(matches) > 1:
@@ -92,50 +190,72 @@ def find_row(
     return None, suggestions, 0
 
 
-def find_header_row(ws, header_text: str, max_rows: int = 6) -> int | None:
-    for row in range(1, max_rows + 1):
-        for col in range(1, ws.max_column + 1):
-            value = ws.cell(row=row, column=col).value
-            if isinstance(value, str) and normalize_label(value) == normalize_label(header_text):
-                return row
-    return None
+def header_band(ws, max_rows: int = 6, max_col: int | None = None) -> list[tuple]:
+    if max_col is None:
+        max_col = ws.max_column
+    return list(ws.iter_rows(min_row=1, max_row=max_rows, max_col=max_col, values_only=True))
 
 
-def resolve_mvd_column(ws) -> int | None:
-    for row in range(1, 6):
-        for col in range(1, ws.max_column + 1):
-            value = ws.cell(row=row, column=col).value
-            if isinstance(value, str) and normalize_label(value) == normalize_label("МВД"):
-                return col
+def band_value(band: list[tuple], row: int, col: int) -> Any:
+    if row > len(band) or col > len(band[row - 1]):
+        return None
+    return band[row - 1][col - 1]
+
+
+def find_header_row(ws, header_text: str, max_rows: int = 6, band: list[tuple] | None = None) -> int | None:
+    if band is None or len(band) < max_rows:
+        band = header_band(ws, max_rows)
+    target = normalize_label(header_text)
+    for row, values in enumerate(band[:max_rows], start=1):
+        for value in values:
+            if isinstance(value, str) and normalize_label(value) == target:
+                return row
     return None
 
 
-def resolve_mvd_block(ws) -> list[int]:
+def resolve_mvd(ws, band: list[tuple] | None = None) -> tuple[int | None, list[int]]:
+    if band is None:
+        band = header_band(ws)
+    target = normalize_label("МВД")
     mvd_cell = None
-    for row in range(1, 6):
-        for col in range(1, ws.max_column + 1):
-            value = ws.cell(row=row, column=col).value
-            if isinstance(value, str) and normalize_label(value) == normalize_label("МВД"):
+    for row, values in enumerate(band[:5], start=1):
+        for col, value in enumerate(values, start=1):
+            if isinstance(value, str) and normalize_label(value) == target:
                 mvd_cell = (row, col)
                 break
         if mvd_cell:
             break
     if not mvd_cell:
-        return []
+        return None, []
 
     # check merged ranges
     for merged in ws.merged_cells.ranges:
         if merged.min_row <= mvd_cell[0] <= merged.max_row and merged.min_col <= mvd_cell[1] <= merged.max_col:
-            return list(range(merged.min_col, merged.max_col + 1))
+            return mvd_cell[1], list(range(merged.min_col, merged.max_col + 1))
 
     # fallback to 4 columns block
-    return list(range(mvd_cell[1], mvd_cell[1] + 4))
+    return mvd_cell[1], list(range(mvd_cell[1], mvd_cell[1] + 4))
+
 
+def resolve_mvd_column(ws, band: list[tuple] | None = None) -> int | None:
+    return resolve_mvd(ws, band)[0]
 
-def resolve_column_in_block(ws, block_cols: list[int], header_contains: str) -> int | None:
+
+def resolve_mvd_block(ws, band: list[tuple] | None = None) -> list[int]:
+    return resolve_mvd(ws, band)[1]
+
+
+def resolve_column_in_block(
+    ws,
+    block_cols: list[int],
+    header_contains: str,
+    band: list[tuple] | None = None,
+) -> int | None:
+    if band is None:
+        band = header_band(ws)
     header_row = None
     for row in range(1, 6):
-        row_values = [ws.cell(row=row, column=c).value for c in block_cols]
+        row_values = [band_value(band, row, c) for c in block_cols]
         if any(isinstance(v, str) and v.strip() for v in row_values):
             header_row = row
     if header_row is None:
@@ -143,7 +263,7 @@ def resolve_column_in_block(ws, block_cols: list[int], header_contains: str) ->
 
     target = normalize_label(header_contains)
     for col in block_cols:
-        value = ws.cell(row=header_row, column=col).value
+        value = band_value(band, header_row, col)
         if isinstance(value, str) and target in normalize_label(value):
             return col
     return None
@@ -154,6 +274,11 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
     errors = []
     warnings = []
     debug = []
+    # Targets on the same sheet share one read and normalization of their label column.
+    label_columns: dict = {}
+    code_columns: dict = {}
+    mvd_columns: dict[str, int | None] = {}
+    sheet_index = build_sheet_index(workbook)
 
     for metric_key, rule in excel_map.items():
         if metric_key not in metrics:
@@ -161,7 +286,7 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
         targets = rule.get("targets", [])
         for target in targets:
             sheet_name = target.get("sheet")
-            resolved_sheet = resolve_sheet(workbook, sheet_name)
+            resolved_sheet = resolve_sheet(workbook, sheet_name, sheet_index)
             if not resolved_sheet:
                 errors.append(
                     {
@@ -174,14 +299,24 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
                 continue
 
             ws = workbook[resolved_sheet]
+            labels, normalized_labels, label_index = _label_column(
+                label_columns, ws, target.get("row_label_column", "B")
+            )
+            row_code = target.get("row_code")
+            codes = _code_column(code_columns, ws, target.get("row_code_column", "A")) if row_code else None
             row, suggestions, match_count = find_row(
                 ws,
                 target.get("row_label"),
                 target.get("row_label_contains"),
                 target.get("row_label_regex"),
                 target.get("row_label_column", "B"),
-                target.get("row_code"),
+                row_code,
                 target.get("row_code_column", "A"),
+                labels=labels,
+                normalized_labels=normalized_labels,
+                suggest_on_match=False,
+                label_index=label_index,
+                codes=codes,
             )
             if row is None:
                 if match_count > 1:
@@ -207,7 +342,11 @@ def plan_metric_updates(workbook, metrics: dict, excel_map: dict) -> tuple[list[
                 continue
 
             col_key = target.get("col_key", "МВД")
-            col = resolve_mvd_column(ws) if normalize_label(col_key) == normalize_label("МВД") else None
+            col = None
+            if normalize_label(col_key) == normalize_label("МВД"):
+                if resolved_sheet not in mvd_columns:
+                    mvd_columns[resolved_sheet] = resolve_mvd_column(ws)
+                col = mvd_columns[resolved_sheet]
             if col is None:
                 errors.append(
                     {
@@ -268,7 +407,8 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
         return updates, errors, warnings, debug
 
     ws = workbook[resolved_sheet]
-    block_cols = resolve_mvd_block(ws)
+    band = header_band(ws)
+    block_cols = resolve_mvd_block(ws, band)
     if not block_cols:
         errors.append(
             {
@@ -282,6 +422,9 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
 
     row_label_column = article_map.get("row_label_column", "B")
     fields = article_map.get("fields", {})
+    labels, normalized_labels, label_index = _label_column({}, ws, row_label_column)
+    # Field columns depend only on the header band, not on the article row.
+    field_columns: dict[str, int | None] = {}
 
     for row in article_breakdown:
         article = row.get("article")
@@ -295,6 +438,10 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
             row_label_column,
             None,
             "A",
+            labels=labels,
+            normalized_labels=normalized_labels,
+            suggest_on_match=False,
+            label_index=label_index,
         )
         if excel_row is None:
             if match_count > 1:
@@ -322,7 +469,11 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
         for field_key, field_rule in fields.items():
             if field_key not in row:
                 continue
-            col = resolve_column_in_block(ws, block_cols, field_rule.get("header_contains", ""))
+            if field_key not in field_columns:
+                field_columns[field_key] = resolve_column_in_block(
+                    ws, block_cols, field_rule.get("header_contains", ""), band
+                )
+            col = field_columns[field_key]
             if col is None:
                 errors.append(
                     {
@@ -359,8 +510,16 @@ def plan_article_updates(workbook, article_breakdown: list[dict], article_map: d
     return updates, errors, warnings, debug
 
 
-def plan_updates(excel_path: str, metrics: dict, article_breakdown: list[dict], excel_map: dict, article_map: dict):
-    workbook = load_workbook(excel_path)
+def plan_updates(
+    excel_path: str,
+    metrics: dict,
+    article_breakdown: list[dict],
+    excel_map: dict,
+    article_map: dict,
+    workbook=None,
+):
+    if workbook is None:
+        workbook = load_workbook(excel_path)
     metric_updates, metric_errors, metric_warnings, metric_debug = plan_metric_updates(
         workbook, metrics, excel_map
     )
@@ -395,9 +554,16 @@ def apply_updates(
     excel_path: str,
     output_path: str,
     updates: list[dict],
+    workbook=None,
 ) -> None:
-    workbook = load_workbook(excel_path)
-    for update in updates:
-        ws = workbook[update["sheet"]]
-        ws.cell(row=update["row"], column=update["col"], value=update["newValue"])
+    # Planning only reads cells, so the workbook kept from Analyze can be written directly.
+    if workbook is None:
+        workbook = load_workbook(excel_path)
+    # sorted() is stable, so repeated writes to one cell keep their planned order.
+    for sheet_name, sheet_updates in itertools.groupby(
+        sorted(updates, key=operator.itemgetter("sheet")), key=operator.itemgetter("sheet")
+    ):
+        ws = workbook[sheet_name]
+        for update in sheet_updates:
+            ws.cell(row=update["row"], column=update["col"], value=update["newValue"])
     workbook.save(output_path)
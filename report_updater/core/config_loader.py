@@ -1,5 +1,7 @@
 ﻿from __future__ import annotations
 
+import copy
+import functools
 from pathlib import Path
 from typing import Any
 
@@ -9,13 +11,25 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CONFIG_DIR = PROJECT_ROOT / "config"
 
 
-def load_yaml(name: str) -> Any:
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Keyed by mtime so edited configs are re-read; Streamlit reruns hit the cache otherwise.
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(name: str, mtime_ns: int) -> Any:
     path = CONFIG_DIR / name
     with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle)
+        return yaml.load(handle, Loader=YAML_LOADER)
+
+
+def load_yaml(name: str) -> Any:
+    path = CONFIG_DIR / name
+    # Callers get their own copy so the cached config cannot be mutated between runs.
+    return copy.deepcopy(_load_yaml_cached(name, path.stat().st_mtime_ns))
 
 
 def save_yaml(name: str, data: Any) -> None:
     path = CONFIG_DIR / name
     with path.open("w", encoding="utf-8") as handle:
         yaml.safe_dump(data, handle, allow_unicode=True, sort_keys=False)
+    _load_yaml_cached.cache_clear()
@@ -8,25 +8,35 @@ from openpyxl import load_workbook
 from .apply_excel import resolve_mvd_block, resolve_mvd_column, resolve_sheet
 from .normalize import normalize_label
 
+R2_SHEET = normalize_label("Р.2")
+R1_SHEET = normalize_label("Отчет 1-Е Р.1")
+
 
 def diff_template(prev_xlsx: str, current_xlsx: str) -> list[dict]:
     prev = load_workbook(prev_xlsx, data_only=True)
     curr = load_workbook(current_xlsx, data_only=True)
 
     diffs: list[dict] = []
+    curr_names = set(curr.sheetnames)
     for sheet in prev.sheetnames:
-        if sheet not in curr.sheetnames:
+        if sheet not in curr_names:
             continue
         ws_prev = prev[sheet]
         ws_curr = curr[sheet]
+        sheet_label = normalize_label(sheet)
 
-        if normalize_label(sheet) == normalize_label("Р.2"):
+        if sheet_label == R2_SHEET:
             col = resolve_mvd_column(ws_prev)
             if not col:
                 continue
-            for row in range(1, ws_prev.max_row + 1):
-                v_prev = ws_prev.cell(row=row, column=col).value
-                v_curr = ws_curr.cell(row=row, column=col).value
+            max_row = ws_prev.max_row
+            for row, ((v_prev,), (v_curr,)) in enumerate(
+                zip(
+                    ws_prev.iter_rows(min_row=1, max_row=max_row, min_col=col, max_col=col, values_only=True),
+                    ws_curr.iter_rows(min_row=1, max_row=max_row, min_col=col, max_col=col, values_only=True),
+                ),
+                start=1,
+            ):
                 if v_prev != v_curr:
                     diffs.append(
                         {
@@ -38,15 +48,24 @@ def diff_template(prev_xlsx: str, current_xlsx: str) -> list[dict]:
                         }
                     )
 
-        if normalize_label(sheet) == normalize_label("Отчет 1-Е Р.1"):
+        if sheet_label == R1_SHEET:
             block_prev = resolve_mvd_block(ws_prev)
             block_curr = resolve_mvd_block(ws_curr)
             if not block_prev or not block_curr:
                 continue
-            for row in range(1, ws_prev.max_row + 1):
+            max_row = ws_prev.max_row
+            min_col = min(block_prev)
+            max_col = max(block_prev)
+            for row, (values_prev, values_curr) in enumerate(
+                zip(
+                    ws_prev.iter_rows(min_row=1, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True),
+                    ws_curr.iter_rows(min_row=1, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True),
+                ),
+                start=1,
+            ):
                 for col in block_prev:
-                    v_prev = ws_prev.cell(row=row, column=col).value
-                    v_curr = ws_curr.cell(row=row, column=col).value
+                    v_prev = values_prev[col - min_col]
+                    v_curr = values_curr[col - min_col]
                     if v_prev != v_curr:
                         diffs.append(
                             {
@@ -4,18 +4,21 @@ from collections import Counter
 from typing import Any
 
 from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import column_index_from_string, get_column_letter
 
-from .apply_excel import resolve_mvd_block, resolve_mvd_column, resolve_sheet
+from .apply_excel import band_value, build_sheet_index, header_band, resolve_mvd_block, resolve_mvd_column, resolve_sheet
 from .normalize import normalize_label
 
 
-def _header_snapshot(ws, max_rows: int = 3) -> list[dict]:
+def _header_snapshot(ws, max_rows: int = 3, max_col: int | None = None) -> list[dict]:
+    if max_col is None:
+        max_col = ws.max_column
     rows: list[dict] = []
-    for row in range(1, max_rows + 1):
+    for row, row_values in enumerate(
+        ws.iter_rows(min_row=1, max_row=max_rows, max_col=max_col, values_only=True), start=1
+    ):
         values = []
-        for col in range(1, ws.max_column + 1):
-            value = ws.cell(row=row, column=col).value
+        for col, value in enumerate(row_values, start=1):
             if value is None or str(value).strip() == "":
                 continue
             values.append({"col": get_column_letter(col), "value": value})
@@ -24,11 +27,16 @@ def _header_snapshot(ws, max_rows: int = 3) -> list[dict]:
     return rows
 
 
-def _sheet_label_stats(ws, label_col: str = "B") -> dict:
+def _sheet_label_stats(ws, label_col: str = "B", max_row: int | None = None) -> dict:
+    if max_row is None:
+        max_row = ws.max_row
     labels: list[str] = []
     rows: list[tuple[int, str]] = []
-    for row in range(1, ws.max_row + 1):
-        value = ws[f"{label_col}{row}"].value
+    col_index = column_index_from_string(label_col)
+    for row, (value,) in enumerate(
+        ws.iter_rows(min_row=1, max_row=max_row, min_col=col_index, max_col=col_index, values_only=True),
+        start=1,
+    ):
         if isinstance(value, str) and value.strip():
             labels.append(value.strip())
             rows.append((row, value.strip()))
@@ -49,43 +57,50 @@ def _sheet_label_stats(ws, label_col: str = "B") -> dict:
 def inspect_excel(excel_path: str) -> dict[str, Any]:
     workbook = load_workbook(excel_path, data_only=True)
     summaries: list[dict[str, Any]] = []
+    # Writable worksheets derive max_row/max_column from every stored cell, so read them once per sheet.
+    dimensions: dict[str, tuple[int, int]] = {}
     for sheet in workbook.sheetnames:
         ws = workbook[sheet]
+        max_row, max_col = dimensions[sheet] = (ws.max_row, ws.max_column)
         summaries.append(
             {
                 "sheet": sheet,
-                "max_row": ws.max_row,
-                "max_col": ws.max_column,
-                "headers": _header_snapshot(ws),
+                "max_row": max_row,
+                "max_col": max_col,
+                "headers": _header_snapshot(ws, max_col=max_col),
             }
         )
 
     details: dict[str, Any] = {}
-    sheet_r2 = resolve_sheet(workbook, "Р.2")
+    sheet_index = build_sheet_index(workbook)
+    sheet_r2 = resolve_sheet(workbook, "Р.2", sheet_index)
     if sheet_r2:
         ws = workbook[sheet_r2]
+        max_row, max_col = dimensions[sheet_r2]
         details["r2"] = {
             "sheet": sheet_r2,
-            "mvd_col": resolve_mvd_column(ws),
-            "labels": _sheet_label_stats(ws, "B"),
+            "mvd_col": resolve_mvd_column(ws, header_band(ws, max_col=max_col)),
+            "labels": _sheet_label_stats(ws, "B", max_row),
             "row_code_column": "A",
         }
 
-    sheet_r1 = resolve_sheet(workbook, "Отчет 1-Е Р.1") or resolve_sheet(workbook, "Р.1")
+    sheet_r1 = resolve_sheet(workbook, "Отчет 1-Е Р.1", sheet_index) or resolve_sheet(workbook, "Р.1", sheet_index)
     if sheet_r1:
         ws = workbook[sheet_r1]
-        block_cols = resolve_mvd_block(ws)
+        max_row, max_col = dimensions[sheet_r1]
+        band = header_band(ws, max_col=max_col)
+        block_cols = resolve_mvd_block(ws, band)
         subheaders = {}
         if block_cols:
             for col in block_cols:
-                value = ws.cell(row=2, column=col).value
+                value = band_value(band, 2, col)
                 if isinstance(value, str) and value.strip():
                     subheaders[get_column_letter(col)] = value.strip()
         details["r1"] = {
             "sheet": sheet_r1,
             "mvd_block": [get_column_letter(col) for col in block_cols] if block_cols else [],
             "subheaders": subheaders,
-            "labels": _sheet_label_stats(ws, "B"),
+            "labels": _sheet_label_stats(ws, "B", max_row),
         }
 
     return {"sheets": summaries, "details": details}
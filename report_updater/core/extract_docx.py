@@ -3,14 +3,15 @@
 import re
 from dataclasses import dataclass
 from datetime import date
-from typing import Any
+from typing import IO, Any
 
 from docx import Document
+from docx.oxml.ns import qn
 
 from .normalize import (
     MONTHS,
-    STOP_WORDS,
-    contains_any,
+    STOP_WORD_STEMS,
+    minimal_stems,
     normalize_article,
     normalize_text,
     parse_date_from_text,
@@ -22,12 +23,38 @@ REPORT_MONTH_PATTERNS = [
     re.compile(r"за\s+([А-Яа-яЁё]+)\s+(\d{4})\s*г", re.IGNORECASE),
 ]
 
+NUMBER_PATTERN = re.compile(r"(\d[\d\s]*)")
 CASE_ID_PATTERN = re.compile(r"(?:ЕРП|КЖБР)\s*№?\s*([\d\-/]+)", re.IGNORECASE)
 ALT_CASE_ID_PATTERN = re.compile(r"\b\d{2}-\d{3}-\d{4}-\d{6}\b")
 FALLBACK_CASE_ID_PATTERN = re.compile(r"\b\d{6,}\b")
 
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+# Leading inline flags that do not change how literal text matches; metrics.yaml patterns start with (?i).
+LEADING_FLAGS_PATTERN = re.compile(r"\(\?[aimsu]+\)")
+
 WOMEN_TAGS = ["аялга карата", "аялдар", "аялга", "аял"]
 MINOR_TAGS = ["жашы жетпеген", "жашы жетпегендер", "жаш өспүрүм", "өспүрүм", "балдар", "балдарга"]
+WOMEN_TAG_STEMS = minimal_stems(WOMEN_TAGS)
+MINOR_TAG_STEMS = minimal_stems(MINOR_TAGS)
+BREAKDOWN_FIELDS = ("women_u18", "women_ge18", "women_total", "stopped", "new", "total_cases")
+
+W_P = qn("w:p")
+W_R = qn("w:r")
+W_T = qn("w:t")
+W_HYPERLINK = qn("w:hyperlink")
+W_TBL = qn("w:tbl")
+W_TR = qn("w:tr")
+W_TC = qn("w:tc")
+W_TRPR = qn("w:trPr")
+W_TCPR = qn("w:tcPr")
+W_GRID_BEFORE = qn("w:gridBefore")
+W_GRID_SPAN = qn("w:gridSpan")
+W_VMERGE = qn("w:vMerge")
+W_VAL = qn("w:val")
+# The XML readers and the metric keyword prefilter below follow processor/extract_word.py
+# (snapshot_document, _metric_keyword_index), where their rationale is documented. The readers
+# must keep matching python-docx's Paragraph.text and Row.cells, see tests/test_extract_docx.py.
+RUN_TEXT_TAGS = frozenset(qn(tag) for tag in ("w:br", "w:cr", "w:noBreakHyphen", "w:ptab", "w:tab"))
 
 
 @dataclass
@@ -56,25 +83,82 @@ def parse_report_month(paragraphs: list[str]) -> dict | None:
     return None
 
 
+def _regex_literal_prefix(regex: str) -> str:
+    if "|" in regex:
+        return ""
+    flags = LEADING_FLAGS_PATTERN.match(regex)
+    start = end = flags.end() if flags else 0
+    while end < len(regex) and regex[end] not in REGEX_METACHARACTERS:
+        end += 1
+    if end < len(regex) and regex[end] in "*+?{":
+        end -= 1
+    return regex[start:max(end, start)].lower()
+
+
+def _compile_metrics_config(metrics_config: dict) -> list[tuple[str, list[tuple[re.Pattern, str]], list[str]]]:
+    return [
+        (
+            key,
+            [(re.compile(pattern, re.IGNORECASE), _regex_literal_prefix(pattern)) for pattern in entry.get("regex", [])],
+            [phrase.lower() for phrase in entry.get("phrases", [])],
+        )
+        for key, entry in metrics_config.items()
+    ]
+
+
+def _metric_keyword_index(
+    compiled_metrics: list[tuple[str, list[tuple[re.Pattern, str]], list[str]]],
+) -> tuple[re.Pattern | None, dict[str, set[str]], set[str]]:
+    owners: dict[str, set[str]] = {}
+    always: set[str] = set()
+    for key, patterns, phrases in compiled_metrics:
+        literals = [literal for _, literal in patterns]
+        if "" in literals:
+            always.add(key)
+            continue
+        for keyword in (*literals, *phrases):
+            owners.setdefault(keyword, set()).add(key)
+    if not owners:
+        return None, owners, always
+    keywords = sorted(owners, key=len, reverse=True)
+    closed = {
+        keyword: set().union(*(owners[prefix] for prefix in owners if keyword.startswith(prefix)))
+        for keyword in keywords
+    }
+    return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))"), closed, always
+
+
 def extract_metrics(paragraphs: list[str], metrics_config: dict) -> tuple[dict, list[dict], list[dict]]:
     metrics: dict[str, dict[str, Any]] = {}
     warnings: list[dict] = []
+    compiled_metrics = _compile_metrics_config(metrics_config)
+    keyword_pattern, keyword_owners, always = _metric_keyword_index(compiled_metrics)
 
     for idx, raw in enumerate(paragraphs):
         text = normalize_text(raw)
         lowered = text.lower()
-        for key, entry in metrics_config.items():
+        candidates = set(always)
+        if keyword_pattern is not None:
+            for keyword in {match.group(1) for match in keyword_pattern.finditer(lowered)}:
+                candidates |= keyword_owners[keyword]
+        if not candidates:
+            continue
+        for key, patterns, phrases in compiled_metrics:
+            if key not in candidates:
+                continue
             found = None
-            for pattern in entry.get("regex", []):
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern, literal in patterns:
+                if literal not in lowered:
+                    continue
+                match = pattern.search(text)
                 if match:
                     found = match.group(1)
                     break
             if found is None:
-                for phrase in entry.get("phrases", []):
-                    if phrase.lower() in lowered:
-                        found = re.search(r"(\d[\d\s]*)", text)
-                        found = found.group(1) if found else None
+                for phrase in phrases:
+                    if phrase in lowered:
+                        number = NUMBER_PATTERN.search(text)
+                        found = number.group(1) if number else None
                         break
             if found is None:
                 continue
@@ -111,25 +195,92 @@ def extract_metrics(paragraphs: list[str], metrics_config: dict) -> tuple[dict,
     return metrics, metrics_list, warnings
 
 
+def _run_text(run: Any, parts: list[str]) -> None:
+    for child in run:
+        if child.tag == W_T:
+            parts.append(child.text or "")
+        elif child.tag in RUN_TEXT_TAGS:
+            parts.append(str(child))
+
+
+def _paragraph_text(paragraph: Any) -> str:
+    parts: list[str] = []
+    for child in paragraph:
+        if child.tag == W_R:
+            _run_text(child, parts)
+        elif child.tag == W_HYPERLINK:
+            for run in child:
+                if run.tag == W_R:
+                    _run_text(run, parts)
+    return "".join(parts)
+
+
+def _child_val(element: Any, property_tag: str, tag: str) -> str | None:
+    properties = element.find(property_tag)
+    if properties is None:
+        return None
+    child = properties.find(tag)
+    if child is None:
+        return None
+    return child.get(W_VAL, "continue" if tag == W_VMERGE else None)
+
+
+def _table_grid_rows(tbl: Any) -> list[list[Any]]:
+    rows: list[list[Any]] = []
+    above: dict[int, Any] | None = None
+    spans: dict[Any, int] = {}
+    for tr in tbl.iterchildren(W_TR):
+        offset = int(_child_val(tr, W_TRPR, W_GRID_BEFORE) or 0)
+        starts: dict[int, Any] = {}
+        row: list[Any] = []
+        for tc in tr.iterchildren(W_TC):
+            span = spans[tc] = int(_child_val(tc, W_TCPR, W_GRID_SPAN) or 1)
+            root = tc
+            if _child_val(tc, W_TCPR, W_VMERGE) == "continue":
+                if above is None:
+                    raise ValueError("no tr above topmost tr in w:tbl")
+                root = above.get(offset)
+                if root is None:
+                    raise ValueError(f"no `tc` element at grid_offset={offset}")
+            starts[offset] = root
+            row.extend([root] * spans[root])
+            offset += span
+        rows.append(row)
+        above = starts
+    return rows
+
+
+def _table_cell_texts(tbl: Any) -> list[list[str]]:
+    seen_cells: dict[Any, str] = {}
+    rows: list[list[str]] = []
+    for row in _table_grid_rows(tbl):
+        cell_texts = []
+        for tc in row:
+            text = seen_cells.get(tc)
+            if text is None:
+                text = seen_cells[tc] = normalize_text("\n".join(_paragraph_text(p) for p in tc.iterchildren(W_P)))
+            cell_texts.append(text)
+        rows.append(cell_texts)
+    return rows
+
+
 def extract_cases(document: Document) -> tuple[list[dict], list[dict]]:
     cases: list[dict] = []
     warnings: list[dict] = []
 
-    for t_index, table in enumerate(document.tables):
+    for t_index, tbl in enumerate(document.element.body.iterchildren(W_TBL)):
         table_seen: dict[str, int] = {}
-        for r_index, row in enumerate(table.rows):
-            cell_texts = [normalize_text(cell.text) for cell in row.cells]
+        for r_index, cell_texts in enumerate(_table_cell_texts(tbl)):
             if not any(cell_texts):
                 continue
             row_text = " | ".join(cell_texts)
-            combined_text = " ".join(cell_texts[:6]) if len(cell_texts) >= 6 else row_text
 
+            # The pattern cannot span the " | " separator, so the leftmost row match is the first
+            # matching cell's match; the search starts at column 0 and stops at the first id found.
             case_id = None
-            for cell_text in cell_texts:
-                match = CASE_ID_PATTERN.search(cell_text)
-                if match:
-                    case_id = match.group(1)
-                    break
+            match = CASE_ID_PATTERN.search(row_text)
+            if match:
+                case_id = match.group(1)
             if case_id is None:
                 match = ALT_CASE_ID_PATTERN.search(row_text)
                 if match:
@@ -153,6 +304,8 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict]]:
                 cases = [c for c in cases if c.get("case_id") != case_id or c.get("table_index") != t_index + 1]
             table_seen[case_id] = r_index
 
+            # Only rows that carry a case id need the date text.
+            combined_text = " ".join(cell_texts[:6]) if len(cell_texts) >= 6 else row_text
             registered_date = parse_date_from_text(combined_text)
             article = normalize_article(row_text)
 
@@ -162,9 +315,10 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict]]:
             else:
                 outcome = row_text
 
-            tags_text = " ".join(cell_texts[2:4]) if len(cell_texts) >= 4 else row_text
-            women_tag = contains_any(tags_text, WOMEN_TAGS)
-            minor_tag = contains_any(tags_text, MINOR_TAGS)
+            # Cells are already normalized, so the tag text only needs lowering once.
+            tags_lower = (" ".join(cell_texts[2:4]) if len(cell_texts) >= 4 else row_text).lower()
+            women_tag = any(stem in tags_lower for stem in WOMEN_TAG_STEMS)
+            minor_tag = any(stem in tags_lower for stem in MINOR_TAG_STEMS)
 
             cases.append(
                 {
@@ -182,21 +336,24 @@ def extract_cases(document: Document) -> tuple[list[dict], list[dict]]:
 
 
 def apply_case_flags(cases: list[dict], report_month: dict | None) -> list[dict]:
+    # Cases cluster on a few registration dates, so each distinct date is parsed once.
+    new_by_date: dict[str, bool] = {}
     for case in cases:
-        reg_date = None
-        if case.get("registered_date"):
-            try:
-                year, month, day = case["registered_date"].split("-")
-                reg_date = date(int(year), int(month), int(day))
-            except ValueError:
-                reg_date = None
-
+        registered_date = case.get("registered_date")
         is_new = False
-        if reg_date and report_month:
-            is_new = reg_date.year == report_month["year"] and reg_date.month == report_month["month"]
+        if registered_date and report_month:
+            is_new = new_by_date.get(registered_date)
+            if is_new is None:
+                try:
+                    reg_date = date.fromisoformat(registered_date)
+                except ValueError:
+                    is_new = False
+                else:
+                    is_new = reg_date.year == report_month["year"] and reg_date.month == report_month["month"]
+                new_by_date[registered_date] = is_new
 
         normalized_outcome = normalize_text(case.get("outcome", "")).lower()
-        has_stop_word = any(word in normalized_outcome for word in STOP_WORDS)
+        has_stop_word = any(stem in normalized_outcome for stem in STOP_WORD_STEMS)
         is_stopped = has_stop_word
 
         case["is_new"] = is_new
@@ -205,12 +362,15 @@ def apply_case_flags(cases: list[dict], report_month: dict | None) -> list[dict]
 
 
 def build_article_breakdown(cases: list[dict], report_month: dict | None) -> list[dict]:
-    breakdown: dict[str, dict[str, int]] = {}
+    breakdown: dict[str, list[int]] = {}
+    month_prefix = f"{report_month['year']:04d}-{report_month['month']:02d}-" if report_month else None
 
     for case in cases:
-        if report_month and case.get("registered_date"):
+        registered_date = case.get("registered_date")
+        # ISO dates inside the report month match the prefix; anything else gets the full check.
+        if month_prefix and registered_date and not registered_date.startswith(month_prefix):
             try:
-                year, month, day = case["registered_date"].split("-")
+                year, month, day = registered_date.split("-")
                 if int(year) != report_month["year"] or int(month) != report_month["month"]:
                     continue
             except ValueError:
@@ -218,43 +378,37 @@ def build_article_breakdown(cases: list[dict], report_month: dict | None) -> lis
         article = case.get("article")
         if not article:
             continue
-        if article not in breakdown:
-            breakdown[article] = {
-                "women_u18": 0,
-                "women_ge18": 0,
-                "women_total": 0,
-                "stopped": 0,
-                "new": 0,
-                "total_cases": 0,
-            }
-        row = breakdown[article]
-        women = case.get("tags", {}).get("women", False)
-        minor = case.get("tags", {}).get("minor", False)
-        if women and minor:
-            row["women_u18"] += 1
-        if women and not minor:
-            row["women_ge18"] += 1
+        row = breakdown.get(article)
+        if row is None:
+            row = breakdown[article] = [0] * len(BREAKDOWN_FIELDS)
+        # Counters are indexed in BREAKDOWN_FIELDS order.
+        tags = case.get("tags", {})
+        if tags.get("women", False):
+            row[0 if tags.get("minor", False) else 1] += 1
+            row[2] += 1
         if case.get("is_stopped"):
-            row["stopped"] += 1
+            row[3] += 1
         if case.get("is_new"):
-            row["new"] += 1
-        row["total_cases"] += 1
-
-    for row in breakdown.values():
-        row["women_total"] = row["women_u18"] + row["women_ge18"]
+            row[4] += 1
+        row[5] += 1
 
     return [
         {
             "article": key,
-            **values,
+            **dict(zip(BREAKDOWN_FIELDS, values)),
         }
         for key, values in sorted(breakdown.items())
     ]
 
 
-def extract_docx(docx_path: str, metrics_config: dict) -> dict:
+def extract_docx(docx_path: str | IO[bytes], metrics_config: dict) -> dict:
     document = Document(docx_path)
-    paragraphs = [normalize_text(p.text) for p in document.paragraphs if p.text.strip()]
+    # Read paragraph text straight from the body XML; Document.paragraphs builds a proxy per <w:p>.
+    paragraphs = []
+    for p in document.element.body.iterchildren(W_P):
+        text = _paragraph_text(p)
+        if text.strip():
+            paragraphs.append(normalize_text(text))
 
     report_month = parse_report_month(paragraphs)
 
@@ -1,8 +1,8 @@
 ﻿from __future__ import annotations
 
+import functools
 import re
 from datetime import date
-from typing import Iterable
 
 MONTHS = {
     "январь": 1,
@@ -29,22 +29,7 @@ MONTHS = {
     "ноября": 11,
     "декабрь": 12,
     "декабря": 12,
-    "январь".upper(): 1,
-    "февраль".upper(): 2,
-    "март".upper(): 3,
-    "апрель".upper(): 4,
-    "май".upper(): 5,
-    "июнь".upper(): 6,
-    "июль".upper(): 7,
-    "август".upper(): 8,
-    "сентябрь".upper(): 9,
-    "октябрь".upper(): 10,
-    "ноябрь".upper(): 11,
-    "декабрь".upper(): 12,
     "кыркүйөк": 9,
-    "октябрь": 10,
-    "ноябрь": 11,
-    "декабрь": 12,
 }
 
 DATE_PATTERNS = [
@@ -67,31 +52,51 @@ STOP_WORDS = [
 ]
 
 
+def minimal_stems(words: list[str]) -> tuple[str, ...]:
+    # Every word contains one of these stems, so only the stems need to be searched.
+    return tuple(word for word in words if not any(other != word and other in word for other in words))
+
+
+STOP_WORD_STEMS = minimal_stems(STOP_WORDS)
+
+NORMALIZE_TRANSLATION = str.maketrans({"\u00a0": " ", "–": "-", "—": "-"})
+LABEL_TRANSLATION = str.maketrans({"ё": "е"})
+LABEL_NOISE_PATTERN = re.compile(r"[\s\.:;,]+")
+# The article number is always the first digit run, so an "ст"/"бер" prefix never changes the groups.
+ARTICLE_PATTERN = re.compile(r"(\d{1,3})(?:\s*[-–]\s*(\d{1,3}))?(?:\s*[-–]?\s*(\d+)\s*б\.)?")
+NON_DIGIT_PATTERN = re.compile(r"[^0-9]")
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_str(value: str) -> str:
+    return " ".join(value.translate(NORMALIZE_TRANSLATION).split())
+
+
 def normalize_text(value: str) -> str:
     if value is None:
         return ""
-    cleaned = str(value).replace("\u00a0", " ").replace("–", "-").replace("—", "-")
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned.strip()
+    # Labels and cell values repeat heavily across sheets and rows.
+    return _normalize_str(str(value))
 
 
-def normalize_label(value: str) -> str:
-    cleaned = normalize_text(value).lower()
-    cleaned = cleaned.replace("ё", "е")
+@functools.lru_cache(maxsize=8192)
+def _normalize_label_str(text: str) -> str:
+    cleaned = text.lower().translate(LABEL_TRANSLATION)
     cleaned = cleaned.replace("таблица", "т").replace("табл", "т").replace("таб.", "т")
     cleaned = cleaned.replace("т.", "т")
     cleaned = cleaned.replace("ст.", "ст").replace("ст ", "ст")
-    cleaned = re.sub(r"[\s\.:;,]+", "", cleaned)
-    return cleaned
+    return LABEL_NOISE_PATTERN.sub("", cleaned)
+
+
+def normalize_label(value: str) -> str:
+    return _normalize_label_str(normalize_text(value))
 
 
 def normalize_article(value: str) -> str | None:
     if not value:
         return None
-    text = normalize_text(value).lower()
-    text = text.replace("ст.", "ст").replace("ст ", "ст").replace("бер", "бер")
     # patterns: ст.123, 123-бер 3-б.
-    match = re.search(r"(?:ст|бер)?\s*(\d{1,3})(?:\s*[-–]\s*(\d{1,3}))?(?:\s*[-–]?\s*(\d+)\s*б\.)?", text)
+    match = ARTICLE_PATTERN.search(normalize_text(value).lower())
     if not match:
         return None
     base = match.group(1)
@@ -110,10 +115,20 @@ def parse_int(value: str | int | float | None) -> int | None:
         return value
     if isinstance(value, float):
         return int(value)
-    cleaned = re.sub(r"[^0-9]", "", str(value))
+    cleaned = NON_DIGIT_PATTERN.sub("", str(value))
     return int(cleaned) if cleaned else None
 
 
+def _checked_date(year: int, month: int, day: int) -> date | None:
+    # Most malformed dates fail these range checks; only e.g. 31.02 still reaches the ValueError.
+    if not 1 <= month <= 12 or not 1 <= day <= 31:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
 def parse_date_from_text(text: str) -> date | None:
     if not text:
         return None
@@ -122,31 +137,23 @@ def parse_date_from_text(text: str) -> date | None:
         if not match:
             continue
         groups = match.groups()
-        try:
-            if pattern is DATE_PATTERNS[0]:
-                day, month, year = groups
-                if len(year) == 2:
-                    year = f"20{year}"
-                return date(int(year), int(month), int(day))
-            if pattern is DATE_PATTERNS[1]:
-                year, month, day = groups
-                return date(int(year), int(month), int(day))
-            if pattern in (DATE_PATTERNS[2], DATE_PATTERNS[3]):
-                year = int(groups[0])
-                if pattern is DATE_PATTERNS[2]:
-                    day = int(groups[1])
-                    month_name = groups[2]
-                else:
-                    month_name = groups[1]
-                    day = int(groups[2])
-                month = MONTHS.get(month_name.lower())
-                if month:
-                    return date(year, month, day)
-        except ValueError:
-            return None
+        if pattern is DATE_PATTERNS[0]:
+            day, month, year = groups
+            if len(year) == 2:
+                year = f"20{year}"
+            return _checked_date(int(year), int(month), int(day))
+        if pattern is DATE_PATTERNS[1]:
+            year, month, day = groups
+            return _checked_date(int(year), int(month), int(day))
+        if pattern in (DATE_PATTERNS[2], DATE_PATTERNS[3]):
+            year = int(groups[0])
+            if pattern is DATE_PATTERNS[2]:
+                day = int(groups[1])
+                month_name = groups[2]
+            else:
+                month_name = groups[1]
+                day = int(groups[2])
+            month = MONTHS.get(month_name.lower())
+            if month:
+                return _checked_date(year, month, day)
     return None
-
-
-def contains_any(text: str, terms: Iterable[str]) -> bool:
-    lowered = normalize_text(text).lower()
-    return any(term in lowered for term in terms)
@@ -1,6 +1,8 @@
 ﻿from __future__ import annotations
 
 import ast
+import functools
+from collections import Counter
 from datetime import datetime
 from typing import Any
 
@@ -9,36 +11,38 @@ class FormulaError(Exception):
     pass
 
 
-def safe_eval(expression: str, values: dict[str, int]) -> int:
-    tree = ast.parse(expression, mode="eval")
-
-    def eval_node(node: ast.AST) -> int:
-        if isinstance(node, ast.Expression):
-            return eval_node(node.body)
-        if isinstance(node, ast.BinOp):
-            left = eval_node(node.left)
-            right = eval_node(node.right)
-            if isinstance(node.op, ast.Add):
-                return left + right
-            if isinstance(node.op, ast.Sub):
-                return left - right
+def _formula_terms(node: ast.AST, sign: int, coefficients: dict[str, int]) -> int:
+    # Operands are checked before their operator, so the first unsupported node reported stays the same.
+    if isinstance(node, ast.BinOp):
+        right_sign = -sign if isinstance(node.op, ast.Sub) else sign
+        constant = _formula_terms(node.left, sign, coefficients) + _formula_terms(node.right, right_sign, coefficients)
+        if not isinstance(node.op, (ast.Add, ast.Sub)):
             raise FormulaError("Unsupported operator")
-        if isinstance(node, ast.UnaryOp):
-            operand = eval_node(node.operand)
-            if isinstance(node.op, ast.USub):
-                return -operand
-            if isinstance(node.op, ast.UAdd):
-                return operand
+        return constant
+    if isinstance(node, ast.UnaryOp):
+        constant = _formula_terms(node.operand, -sign if isinstance(node.op, ast.USub) else sign, coefficients)
+        if not isinstance(node.op, (ast.USub, ast.UAdd)):
             raise FormulaError("Unsupported unary operator")
-        if isinstance(node, ast.Name):
-            return int(values.get(node.id, 0))
-        if isinstance(node, ast.Num):
-            return int(node.n)
-        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-            return int(node.value)
-        raise FormulaError("Unsupported expression")
+        return constant
+    if isinstance(node, ast.Name):
+        coefficients[node.id] = coefficients.get(node.id, 0) + sign
+        return 0
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return sign * int(node.value)
+    raise FormulaError("Unsupported expression")
+
+
+# Cross-check formulas only add and subtract, so each compiles once to a constant plus ±name terms.
+@functools.lru_cache(maxsize=256)
+def _compile_formula(expression: str) -> tuple[int, tuple[tuple[str, int], ...]]:
+    coefficients: dict[str, int] = {}
+    constant = _formula_terms(ast.parse(expression, mode="eval").body, 1, coefficients)
+    return constant, tuple(coefficients.items())
 
-    return eval_node(tree)
+
+def safe_eval(expression: str, values: dict[str, int]) -> int:
+    constant, terms = _compile_formula(expression)
+    return constant + sum(coefficient * int(values.get(name, 0)) for name, coefficient in terms)
 
 
 def validate_data(
@@ -82,8 +86,24 @@ def validate_data(
     for warn in extracted.get("case_warnings", []):
         warnings.append(warn)
 
+    out_of_month = 0
+    # Cases cluster on a few registration dates, so each distinct date is parsed once.
+    date_in_month: dict[str, bool | None] = {}
     for case in cases:
-        if not case.get("registered_date"):
+        date_str = case.get("registered_date")
+        if date_str and report_month:
+            if date_str not in date_in_month:
+                try:
+                    parsed = datetime.fromisoformat(date_str)
+                except ValueError:
+                    date_in_month[date_str] = None
+                else:
+                    date_in_month[date_str] = (
+                        parsed.year == report_month["year"] and parsed.month == report_month["month"]
+                    )
+            if date_in_month[date_str] is False:
+                out_of_month += 1
+        if not date_str:
             warnings.append(
                 {
                     "type": "warning",
@@ -102,8 +122,8 @@ def validate_data(
                 }
             )
 
-    case_ids = [case.get("case_id") for case in cases if case.get("case_id")]
-    duplicates = sorted({cid for cid in case_ids if case_ids.count(cid) > 1})
+    case_id_counts = Counter(case.get("case_id") for case in cases if case.get("case_id"))
+    duplicates = sorted(cid for cid, count in case_id_counts.items() if count > 1)
     if duplicates:
         warnings.append(
             {
@@ -114,38 +134,33 @@ def validate_data(
             }
         )
 
-    if report_month:
-        out_of_month = 0
-        for case in cases:
-            date_str = case.get("registered_date")
-            if not date_str:
-                continue
-            try:
-                parsed = datetime.fromisoformat(date_str)
-            except ValueError:
-                continue
-            if parsed.year != report_month["year"] or parsed.month != report_month["month"]:
-                out_of_month += 1
-        if out_of_month:
-            warnings.append(
-                {
-                    "type": "warning",
-                    "message": f"{out_of_month} дел вне отчетного месяца.",
-                    "source": "case tables",
-                    "suggestedFix": "Проверьте корректность месяца отчетности.",
-                }
-            )
+    if out_of_month:
+        warnings.append(
+            {
+                "type": "warning",
+                "message": f"{out_of_month} дел вне отчетного месяца.",
+                "source": "case tables",
+                "suggestedFix": "Проверьте корректность месяца отчетности.",
+            }
+        )
 
-    values = {key: data.get("value") for key, data in metrics.items() if isinstance(data.get("value"), int)}
+    values: dict[str, int] = {}
+    for key, data in metrics.items():
+        value = data.get("value")
+        if isinstance(value, int):
+            values[key] = value
     cross_check_results = []
     for target_key, expression in cross_checks.items():
         expected = int(values.get(target_key, 0))
         actual = None
         passed = False
         error_message = None
+        contributions: dict[str, int] = {}
         try:
             actual = safe_eval(expression, values)
             passed = expected == actual
+            # Only the metrics the formula references explain its result.
+            contributions = {name: int(values.get(name, 0)) for name, _ in _compile_formula(expression)[1]}
         except FormulaError as exc:
             error_message = str(exc)
         cross_check_results.append(
@@ -155,7 +170,7 @@ def validate_data(
                 "expected": expected,
                 "actual": actual,
                 "pass": passed,
-                "contributions": {k: int(values.get(k, 0)) for k in values},
+                "contributions": contributions,
             }
         )
         if error_message:
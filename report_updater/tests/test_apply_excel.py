@@ -1,6 +1,6 @@
 from openpyxl import Workbook
 
-from core.apply_excel import find_row, resolve_column_in_block, resolve_mvd_block, resolve_mvd_column
+from core.apply_excel import _code_column, _label_column, find_row, resolve_column_in_block, resolve_mvd_block, resolve_mvd_column
 
 
 def test_resolve_mvd_column() -> None:
@@ -31,6 +31,30 @@ def test_find_row_with_code() -> None:
     assert suggestions
 
 
+def test_find_row_with_label_index() -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws["A3"] = "1"
+    ws["B3"] = "Итого"
+    ws["A7"] = "2"
+    ws["B7"] = "ИТОГО:"
+    labels, normalized_labels, label_index = _label_column({}, ws, "B")
+
+    _, _, match_count = find_row(
+        ws, "Итого", None, None, "B", None, "A",
+        labels=labels, normalized_labels=normalized_labels, label_index=label_index,
+    )
+    assert match_count == 2
+
+    row, _, match_count = find_row(
+        ws, "Итого", None, None, "B", "2", "A",
+        labels=labels, normalized_labels=normalized_labels, label_index=label_index,
+        codes=_code_column({}, ws, "A"),
+    )
+    assert row == 7
+    assert match_count == 1
+
+
 def test_resolve_mvd_block() -> None:
     wb = Workbook()
     ws = wb.active
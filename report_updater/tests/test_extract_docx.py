@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from docx import Document
+
+from core.extract_docx import W_P, W_TBL, _paragraph_text, _table_cell_texts
+from core.normalize import normalize_text
+
+
+def test_xml_readers_match_python_docx(tmp_path: Path) -> None:
+    document = Document()
+    paragraph = document.add_paragraph("ЕРП № 123")
+    run = paragraph.add_run("после")
+    run.add_tab()
+    run.add_break()
+    run.add_text("строки")
+    table = document.add_table(rows=4, cols=4)
+    for r_index, row in enumerate(table.rows):
+        for c_index, cell in enumerate(row.cells):
+            cell.text = f"r{r_index} c{c_index}"
+    table.cell(0, 0).merge(table.cell(2, 1))
+    table.cell(1, 2).merge(table.cell(1, 3))
+    table.cell(2, 3).merge(table.cell(3, 3))
+    path = tmp_path / "merged.docx"
+    document.save(str(path))
+    document = Document(str(path))
+    body = document.element.body
+
+    assert [_paragraph_text(p) for p in body.iterchildren(W_P)] == [p.text for p in document.paragraphs]
+    assert [_table_cell_texts(tbl) for tbl in body.iterchildren(W_TBL)] == [
+        [[normalize_text(cell.text) for cell in row.cells] for row in table.rows]
+        for table in document.tables
+    ]
@@ -1,4 +1,6 @@
-from core.normalize import normalize_article, normalize_label, parse_date_from_text
+import unicodedata
+
+from core.normalize import MONTHS, normalize_article, normalize_label, parse_date_from_text
 
 
 def test_normalize_label_variants() -> None:
@@ -12,6 +14,14 @@ def test_parse_date_from_text() -> None:
     assert (parsed.year, parsed.month, parsed.day) == (2025, 10, 16)
 
 
+def test_months_table() -> None:
+    # Nominative and genitive for each month plus the Kyrgyz кыркүйөк; lookups lower-case first.
+    assert len(MONTHS) == 25
+    assert sorted(set(MONTHS.values())) == list(range(1, 13))
+    assert all(key == unicodedata.normalize("NFC", key.lower()) for key in MONTHS)
+    assert parse_date_from_text("2025-жылдын кыркүйөк 16 күнү").month == 9
+
+
 def test_normalize_article() -> None:
     assert normalize_article("ст. 209") == "ст.209"
     assert normalize_article("209-бер 3-б.") == "ст.209"
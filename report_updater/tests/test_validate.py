@@ -1,4 +1,4 @@
-from core.validate import safe_eval
+from core.validate import safe_eval, validate_data
 
 
 def test_safe_eval_formula() -> None:
@@ -20,3 +20,17 @@ def test_safe_eval_formula() -> None:
         "terminated_cases + suspended_cases)"
     )
     assert safe_eval(expr, values) == 13
+
+
+def test_cross_check_contributions_use_formula_names() -> None:
+    extracted = {
+        "report_month": {"year": 2025, "month": 12, "label": "2025-12"},
+        "metrics": {
+            "total": {"value": 5},
+            "a": {"value": 3},
+            "b": {"value": 2},
+            "unrelated": {"value": 7},
+        },
+    }
+    report = validate_data(extracted, [], {"total": "a + b"}, [], [])
+    assert report["cross_checks"][0]["contributions"] == {"a": 3, "b": 2}